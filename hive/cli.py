@@ -2,12 +2,35 @@
 
 """CLI service router"""
 
+import atexit
 import logging
+from logging.handlers import QueueHandler, QueueListener
+from queue import Queue
+
+def _init_logging():
+    """Route log output through a queue so emitting never blocks on I/O.
+
+    Messages are rendered by the caller's thread and written to stderr,
+    in the default `LEVEL:logger:message` format, by a background
+    listener (e.g. slow-query warnings during sync).
+    """
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    listener = QueueListener(Queue(-1), stream)
+    queue = QueueHandler(listener.queue)
+    queue.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(handlers=[queue])
+    listener.start()
+    atexit.register(listener.stop)
+
+# set up before hive imports: atexit handlers run LIFO, so the listener
+# is stopped only after e.g. Stats.report has logged its final output
+_init_logging()
+
+# pylint: disable=wrong-import-position
 from hive.conf import Conf
 from hive.db.adapter import Db
 
-logging.basicConfig()
-
 def run():
     """Run the service specified in the `--mode` argument."""
 
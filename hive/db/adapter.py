@@ -78,6 +78,26 @@ class Db:
         assert self._is_write_query(sql), sql
         return self._query(sql, **kwargs)
 
+    def query_executemany(self, sql, params):
+        """Perform a (*non-`SELECT`*) write query once per `params` dict.
+
+        Rows are sent as a single DBAPI `executemany` call.
+        """
+        assert self._is_write_query(sql), sql
+        if not params:
+            return None
+
+        try:
+            start = perf()
+            query = self._sql_text(sql)
+            result = self._exec(query, list(params))
+            Stats.log_db(sql, perf() - start)
+            return result
+        except Exception as e:
+            log.warning("[SQL-ERR] %s in executemany %s (%d rows)",
+                        e.__class__.__name__, sql, len(params))
+            raise e
+
     def query_all(self, sql, **kwargs):
         """Perform a `SELECT n*m`"""
         res = self._query(sql, **kwargs)
@@ -190,4 +210,7 @@ class Db:
         if action in ['DELETE', 'UPDATE', 'INSERT', 'COMMIT', 'START',
                       'ALTER', 'TRUNCA', 'CREATE', 'DROP I', 'DROP T']:
             return True
+        if action[0:4] == 'WITH':
+            # data-modifying CTE (e.g. `WITH ins AS (INSERT ...) UPDATE ...`)
+            return True
         raise Exception("unknown action: {}".format(sql))
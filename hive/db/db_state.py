@@ -91,6 +91,8 @@ class DbState:
             'hive_posts_ix5', # (community_id>0, is_pinned=1)
             'hive_follows_ix5a', # (following, state, created_at, follower)
             'hive_follows_ix5b', # (follower, state, created_at, following)
+            'hive_follows_ix6a', # (following, created_at, state IN (1,3))
+            'hive_follows_ix6b', # (follower, created_at, state IN (1,3))
             'hive_reblogs_ix1', # (post_id, account, created_at)
             'hive_posts_cache_ix6a', # (sc_trend, post_id, paidout=0)
             'hive_posts_cache_ix6b', # (post_id, sc_trend, paidout=0)
@@ -332,6 +334,11 @@ class DbState:
             cls.db().query("CREATE UNIQUE INDEX hive_trxid_ix1 ON hive_trxid_block_num (trx_id) WHERE trx_id IS NOT NULL")
             cls._set_ver(20)
 
+        if cls._ver == 20:
+            cls.db().query("CREATE INDEX hive_follows_ix6a ON hive_follows (following, created_at) WHERE state IN (1,3)")
+            cls.db().query("CREATE INDEX hive_follows_ix6b ON hive_follows (follower, created_at) WHERE state IN (1,3)")
+            cls._set_ver(21)
+
         reset_autovac(cls.db())
 
         log.info("[HIVE] db version: %d", cls._ver)
@@ -10,7 +10,7 @@ from sqlalchemy.types import BOOLEAN
 
 #pylint: disable=line-too-long, too-many-lines, bad-whitespace
 
-DB_VERSION = 20
+DB_VERSION = 21
 
 def build_metadata():
     """Build schema def with SqlAlchemy"""
@@ -111,6 +111,8 @@ def build_metadata():
         sa.UniqueConstraint('following', 'follower', name='hive_follows_ux3'), # core
         sa.Index('hive_follows_ix5a', 'following', 'state', 'created_at', 'follower'),
         sa.Index('hive_follows_ix5b', 'follower', 'state', 'created_at', 'following'),
+        sa.Index('hive_follows_ix6a', 'following', 'created_at', postgresql_where=sql_text("state IN (1,3)")), # API: followers page
+        sa.Index('hive_follows_ix6b', 'follower', 'created_at', postgresql_where=sql_text("state IN (1,3)")), # API: following page
     )
 
     sa.Table(
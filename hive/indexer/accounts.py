@@ -114,7 +114,7 @@ class Accounts:
     @classmethod
     def dirty_all(cls):
         """Marks all accounts as dirty. Use to rebuild entire table."""
-        cls.dirty(set(DB.query_col("SELECT name FROM hive_accounts")))
+        cls.dirty_set(set(DB.query_col("SELECT name FROM hive_accounts")))
 
     @classmethod
     def dirty_oldest(cls, limit=50000):
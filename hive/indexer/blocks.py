@@ -10,6 +10,7 @@ from hive.indexer.cached_post import CachedPost
 from hive.indexer.custom_op import CustomOp
 from hive.indexer.payments import Payments
 from hive.indexer.follow import Follow
+from hive.indexer.community import Community
 
 log = logging.getLogger(__name__)
 
@@ -18,6 +19,20 @@ DB = Db.instance()
 class Blocks:
     """Processes blocks, dispatches work, manages `hive_blocks` table."""
 
+    # op types acted upon by `_process`; all others are skipped
+    HANDLED_OPS = frozenset([
+        'vote_operation', 'comment_operation', 'delete_comment_operation',
+        'custom_json_operation', 'transfer_operation',
+        'account_update_operation', 'account_update2_operation',
+        'pow_operation', 'pow2_operation', 'account_create_operation',
+        'account_create_with_delegation_operation',
+        'create_claimed_account_operation'])
+
+    # `hive_blocks` rows, trx ids and dirty accounts pending; see `_flush`
+    _block_rows = []
+    _trxids = []
+    _dirty_accts = set()
+
     @classmethod
     def head_num(cls):
         """Get hive's head block number."""
@@ -34,12 +49,22 @@ class Blocks:
     def process(cls, block):
         """Process a single block. Has wrap in a transaction out of this func!"""
         #assert is_trx_active(), "Block.process must be in a trx"
-        return cls._process(block, is_initial_sync=False)
+        try:
+            num = cls._process(block, is_initial_sync=False)
+        except Exception as e:
+            cls._reset()
+            raise e
+        cls._flush()
+        return num
 
     @classmethod
-    def process_multi(cls, blocks, is_initial_sync=False):
-        """Batch-process blocks; wrapped in a transaction."""
-        DB.query("START TRANSACTION")
+    def process_multi(cls, blocks, is_initial_sync=False, trx=True):
+        """Batch-process blocks; wrapped in a transaction.
+
+        With `trx=False` the caller is responsible for the transaction.
+        """
+        if trx:
+            DB.query("START TRANSACTION")
 
         last_num = 0
         try:
@@ -47,14 +72,19 @@ class Blocks:
                 last_num = cls._process(block, is_initial_sync)
         except Exception as e:
             log.error("exception encountered block %d", last_num + 1)
+            cls._reset()
             raise e
 
+        # one multi-row insert per batch, not per block
+        cls._flush()
+
         # Follows flushing needs to be atomic because recounts are
         # expensive. So is tracking follows at all; hence we track
         # deltas in memory and update follow/er counts in bulk.
         Follow.flush(trx=False)
 
-        DB.query("COMMIT")
+        if trx:
+            DB.query("COMMIT")
 
     @classmethod
     def _process(cls, block, is_initial_sync=False):
@@ -64,57 +94,64 @@ class Blocks:
         date = block['timestamp']
 
         account_names = set()
+        dirty_accts = cls._dirty_accts
         json_ops = []
-        trxids = set()
+        trxids = cls._trxids
+
+        # bind hot lookups once per block
+        handled = cls.HANDLED_OPS
+        add_name = account_names.add
+        add_dirty = dirty_accts.add
+        live = not is_initial_sync
+
+        trxids.extend(["('%s', %d)" % (trx_id, num)
+                       for trx_id in block['transaction_ids']])
+
         for tx_idx, tx in enumerate(block['transactions']):
-            trxids.add("('%s', %s)" % (block['transaction_ids'][tx_idx], num))
             for operation in tx['operations']:
                 op_type = operation['type']
+                if op_type not in handled:
+                    continue
                 op = operation['value']
 
-                # account ops
-                if op_type == 'pow_operation':
-                    account_names.add(op['worker_account'])
-                elif op_type == 'pow2_operation':
-                    account_names.add(op['work']['value']['input']['worker_account'])
-                elif op_type == 'account_create_operation':
-                    account_names.add(op['new_account_name'])
-                elif op_type == 'account_create_with_delegation_operation':
-                    account_names.add(op['new_account_name'])
-                elif op_type == 'create_claimed_account_operation':
-                    account_names.add(op['new_account_name'])
-
-                # account metadata updates
-                elif op_type == 'account_update_operation':
-                    if not is_initial_sync:
-                        Accounts.dirty(op['account']) # full
-                elif op_type == 'account_update2_operation':
-                    if not is_initial_sync:
-                        Accounts.dirty(op['account']) # full
+                # most frequent first
+                if op_type == 'vote_operation':
+                    if live:
+                        add_dirty(op['author']) # lite - rep
+                        add_dirty(op['voter']) # lite - stats
+                        CachedPost.vote(op['author'], op['permlink'],
+                                        None, op['voter'])
 
                 # post ops
                 elif op_type == 'comment_operation':
                     Posts.comment_op(op, date)
-                    if not is_initial_sync:
-                        Accounts.dirty(op['author']) # lite - stats
+                    if live:
+                        add_dirty(op['author']) # lite - stats
                 elif op_type == 'delete_comment_operation':
                     Posts.delete_op(op)
-                elif op_type == 'vote_operation':
-                    if not is_initial_sync:
-                        Accounts.dirty(op['author']) # lite - rep
-                        Accounts.dirty(op['voter']) # lite - stats
-                        CachedPost.vote(op['author'], op['permlink'],
-                                        None, op['voter'])
 
                 # misc ops
-                elif op_type == 'transfer_operation':
-                    Payments.op_transfer(op, tx_idx, num, date)
                 elif op_type == 'custom_json_operation':
                     json_ops.append(op)
+                elif op_type == 'transfer_operation':
+                    Payments.op_transfer(op, tx_idx, num, date)
+
+                # account metadata updates
+                elif op_type in ('account_update_operation',
+                                 'account_update2_operation'):
+                    if live:
+                        add_dirty(op['account']) # full
+
+                # account ops
+                elif op_type == 'pow_operation':
+                    add_name(op['worker_account'])
+                elif op_type == 'pow2_operation':
+                    add_name(op['work']['value']['input']['worker_account'])
+                else: # account_create*, create_claimed_account
+                    add_name(op['new_account_name'])
 
         Accounts.register(account_names, date)     # register any new names
         CustomOp.process_ops(json_ops, num, date)  # follow/reblog/community ops
-        cls.save_trxids(trxids)
 
         return num
 
@@ -162,19 +199,46 @@ class Blocks:
 
     @classmethod
     def _push(cls, block):
-        """Insert a row in `hive_blocks`."""
+        """Queue a row for `hive_blocks`; written by `_flush`."""
         num = int(block['block_id'][:8], base=16)
         txs = block['transactions']
-        DB.query("INSERT INTO hive_blocks (num, hash, prev, txs, ops, created_at) "
-                 "VALUES (:num, :hash, :prev, :txs, :ops, :date)", **{
-                     'num': num,
-                     'hash': block['block_id'],
-                     'prev': block['previous'],
-                     'txs': len(txs),
-                     'ops': sum([len(tx['operations']) for tx in txs]),
-                     'date': block['timestamp']})
+        cls._block_rows.append((
+            num,
+            block['block_id'],
+            block['previous'],
+            len(txs),
+            sum(len(tx['operations']) for tx in txs),
+            block['timestamp']))
         return num
 
+    @classmethod
+    def _reset(cls):
+        """Discard queued rows of a failed block/batch; see `_flush`."""
+        cls._block_rows, cls._trxids, cls._dirty_accts = [], [], set()
+
+    @classmethod
+    def _flush(cls):
+        """Insert queued `hive_blocks` rows and trx ids; queue dirty accounts."""
+        rows, cls._block_rows = cls._block_rows, []
+        if rows:
+            # bind one array per column; the statement text stays constant
+            nums, hashes, prevs, txs, ops, dates = map(list, zip(*rows))
+            DB.query("""INSERT INTO hive_blocks (num, hash, prev, txs, ops, created_at)
+                        SELECT * FROM unnest(CAST(:nums AS integer[]),
+                                             CAST(:hashes AS char(40)[]),
+                                             CAST(:prevs AS char(40)[]),
+                                             CAST(:txs AS smallint[]),
+                                             CAST(:ops AS smallint[]),
+                                             CAST(:dates AS timestamp[]))""",
+                     nums=nums, hashes=hashes, prevs=prevs,
+                     txs=txs, ops=ops, dates=dates)
+
+        trxids, cls._trxids = cls._trxids, []
+        cls.save_trxids(trxids)
+
+        dirty_accts, cls._dirty_accts = cls._dirty_accts, set()
+        Accounts.dirty_set(dirty_accts)
+
     @classmethod
     def _pop(cls, blocks):
         """Pop head blocks to navigate head to a point prior to fork.
@@ -231,6 +295,7 @@ class Blocks:
             DB.query("DELETE FROM hive_trxid_block_num WHERE block_num = :num", num=num)
 
         DB.query("COMMIT")
+        Community.clear_roles()
         log.warning("[FORK] recovery complete")
         # TODO: manually re-process here the blocks which were just popped.
 
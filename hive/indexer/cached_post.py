@@ -278,13 +278,17 @@ class CachedPost:
         return Posts.save_ids_from_tuples(results)
 
     @classmethod
-    def dirty_missing(cls, limit=250000):
-        """Mark dirty all hive_posts records not yet written to cache."""
+    def dirty_missing(cls, limit=250000, last_post_id=None):
+        """Mark dirty all hive_posts records not yet written to cache.
+
+        If known, pass `last_post_id` to skip querying hive_posts for it.
+        """
         from hive.indexer.posts import Posts
 
         # cached posts inserted sequentially, so compare MAX(id)'s
         last_cached_id = cls.last_id()
-        last_post_id = Posts.last_id()
+        if last_post_id is None:
+            last_post_id = Posts.last_id()
         gap = last_post_id - last_cached_id
 
         if gap:
@@ -303,16 +307,21 @@ class CachedPost:
         This is used for (1) initial sync, and (2) recovering missing
         cache records upon launch if hive fast-sync was interrupted.
         """
-        gap = cls.dirty_missing()
+        from hive.indexer.posts import Posts
+
+        # no posts are indexed while recovering; query the target once
+        last_post_id = Posts.last_id()
+
+        gap = cls.dirty_missing(last_post_id=last_post_id)
         log.info("[INIT] %d missing post cache entries", gap)
         while cls.flush(steem, trx=True, full_total=gap)['insert']:
             last_gap = gap
-            gap = cls.dirty_missing()
+            gap = cls.dirty_missing(last_post_id=last_post_id)
             if gap == last_gap:
                 # edge case -- if last post entry was deleted, this
                 # process would never reach condition where the last
                 # cached id == last post id. abort if progress stalls.
-                log.warning('ignoring %d inserts -- may be deleted')
+                log.warning('ignoring %d inserts -- may be deleted', gap)
                 break
 
     @classmethod
@@ -9,13 +9,25 @@ import ujson as json
 
 from hive.db.adapter import Db
 from hive.indexer.accounts import Accounts
-from hive.indexer.notify import Notify
+from hive.indexer.notify import Notify, NotifyType
+from hive.indexer.cached_post import CachedPost
 from hive.db.db_state import DbState
 
 log = logging.getLogger(__name__)
 
 DB = Db.instance()
 
+# `hive.indexer.posts` imports this module; bound on first use by _posts()
+_POSTS = None
+
+def _posts():
+    """Return the `Posts` class, importing it only once."""
+    global _POSTS #pylint: disable=global-statement
+    if _POSTS is None:
+        from hive.indexer.posts import Posts
+        _POSTS = Posts
+    return _POSTS
+
 class Role(IntEnum):
     """Labels for `role_id` field."""
     muted = -2
@@ -43,6 +55,10 @@ LANGS = ("ab,aa,af,ak,sq,am,ar,an,hy,as,av,ae,ay,az,bm,ba,eu,be,bn,bh,bi,"
          "st,es,su,sw,ss,sv,ta,te,tg,th,ti,bo,tk,tl,tn,to,tr,ts,tt,tw,ty,"
          "ug,uk,ur,uz,ve,vi,vo,wa,cy,wo,fy,xh,yi,yo,za").split(',')
 
+# account names which register a community. Only topic communities
+# (type digit 1) for now; journals (2) and councils (3) are not open yet.
+_REGISTER_NAME_RE = re.compile(r'^hive-[1]\d{4,6}$')
+
 def _valid_url_proto(url):
     assert url
     assert isinstance(url, str), 'url was not string'
@@ -103,6 +119,10 @@ class Community:
     # id -> name map
     _names = {}
 
+    # (community_id, account_id) -> role_id map
+    ROLES_CACHE_SIZE = 100000
+    _roles = {}
+
     @classmethod
     def register(cls, names, block_date):
         """Block processing: hooks into new account registration.
@@ -111,24 +131,29 @@ class Community:
         This method checks for any valid community names and inserts them.
         """
 
+        comms = []
         for name in names:
-            #if not re.match(r'^hive-[123]\d{4,6}$', name):
-            if not re.match(r'^hive-[1]\d{4,6}$', name):
+            if not _REGISTER_NAME_RE.match(name):
                 continue
-            type_id = int(name[5])
             _id = Accounts.get_id(name)
+            comms.append(dict(id=_id, name=name, type_id=int(name[5]),
+                              role_id=Role.owner.value, date=block_date))
+        if not comms:
+            return
 
-            # insert community
-            sql = """INSERT INTO hive_communities (id, name, type_id, created_at)
-                          VALUES (:id, :name, :type_id, :date)"""
-            DB.query(sql, id=_id, name=name, type_id=type_id, date=block_date)
+        # insert communities
+        sql = """INSERT INTO hive_communities (id, name, type_id, created_at)
+                      VALUES (:id, :name, :type_id, :date)"""
+        DB.query_executemany(sql, comms)
 
-            # insert owner
-            sql = """INSERT INTO hive_roles (community_id, account_id, role_id, created_at)
-                         VALUES (:community_id, :account_id, :role_id, :date)"""
-            DB.query(sql, community_id=_id, account_id=_id,
-                     role_id=Role.owner.value, date=block_date)
+        # insert owners
+        sql = """INSERT INTO hive_roles (community_id, account_id, role_id, created_at)
+                     VALUES (:id, :id, :role_id, :date)"""
+        DB.query_executemany(sql, comms)
 
+        for comm in comms:
+            _id = comm['id']
+            cls._set_user_role(_id, _id, Role.owner.value)
             Notify('new_community', src_id=None, dst_id=_id,
                    when=block_date, community_id=_id).write()
 
@@ -146,9 +171,11 @@ class Community:
     @classmethod
     def validated_name(cls, name):
         """Perform basic validation on community name, then search for id."""
-        if (name[:5] == 'hive-'
-                and name[5] in ['1', '2', '3']
-                and re.match(r'^hive-[123]\d{4,6}$', name)):
+        # equivalent to: ^hive-[123]\d{4,6}$
+        if (10 <= len(name) <= 12
+                and name[:5] == 'hive-'
+                and name[5] in ('1', '2', '3')
+                and name[6:].isdecimal()):
             return name
         return None
 
@@ -188,13 +215,30 @@ class Community:
     @classmethod
     def get_user_role(cls, community_id, account_id):
         """Get user role within a specific community."""
+        key = (community_id, account_id)
+        if key in cls._roles:
+            return cls._roles[key]
+
+        role_id = DB.query_one("""SELECT role_id FROM hive_roles
+                                   WHERE community_id = :community_id
+                                     AND account_id = :account_id
+                                   LIMIT 1""",
+                               community_id=community_id,
+                               account_id=account_id) or Role.guest.value
+        cls._set_user_role(community_id, account_id, role_id)
+        return role_id
 
-        return DB.query_one("""SELECT role_id FROM hive_roles
-                                WHERE community_id = :community_id
-                                  AND account_id = :account_id
-                                LIMIT 1""",
-                            community_id=community_id,
-                            account_id=account_id) or Role.guest.value
+    @classmethod
+    def _set_user_role(cls, community_id, account_id, role_id):
+        """Cache a user's role, maintaining max cache size."""
+        if len(cls._roles) >= cls.ROLES_CACHE_SIZE:
+            del cls._roles[next(iter(cls._roles))]
+        cls._roles[(community_id, account_id)] = role_id
+
+    @classmethod
+    def clear_roles(cls):
+        """Wipe role cache. Used when roles are rolled back (forks)."""
+        cls._roles = {}
 
     @classmethod
     def is_post_valid(cls, community_id, comment_op: dict):
@@ -275,6 +319,47 @@ class CommunityOp:
         'unsubscribe':    ['community'],
     }
 
+    # SCHEMA key lists as sets, for validation
+    SCHEMA_KEYS = {action: frozenset(keys) for action, keys in SCHEMA.items()}
+
+    PROPS_KEYS = frozenset(('title', 'about', 'lang', 'is_nsfw',
+                            'description', 'flag_text', 'settings'))
+
+    # Fixed SQL for single-statement actions; identical strings let
+    # Db reuse its prepared text() clause for every op of a given type.
+    ACTION_SQL = {
+        'subscribe': """WITH ins AS (
+                          INSERT INTO hive_subscriptions
+                                 (account_id, community_id, created_at)
+                          VALUES (:actor_id, :community_id, :date)
+                     ON CONFLICT DO NOTHING RETURNING 1)
+                    UPDATE hive_communities
+                       SET subscribers = subscribers + (SELECT COUNT(*) FROM ins)
+                     WHERE id = :community_id""",
+        'unsubscribe': """WITH del AS (
+                          DELETE FROM hive_subscriptions
+                           WHERE account_id = :actor_id
+                             AND community_id = :community_id
+                       RETURNING 1)
+                    UPDATE hive_communities
+                       SET subscribers = subscribers - (SELECT COUNT(*) FROM del)
+                     WHERE id = :community_id""",
+        'setRole': """INSERT INTO hive_roles
+                           (account_id, community_id, role_id, created_at)
+                    VALUES (:account_id, :community_id, :role_id, :date)
+                        ON CONFLICT (account_id, community_id)
+                        DO UPDATE SET role_id = :role_id""",
+        'setUserTitle': """INSERT INTO hive_roles
+                           (account_id, community_id, title, created_at)
+                    VALUES (:account_id, :community_id, :title, :date)
+                        ON CONFLICT (account_id, community_id)
+                        DO UPDATE SET title = :title""",
+        'mutePost': "UPDATE hive_posts SET is_muted = '1' WHERE id = :post_id",
+        'unmutePost': "UPDATE hive_posts SET is_muted = '0' WHERE id = :post_id",
+        'pinPost': "UPDATE hive_posts SET is_pinned = '1' WHERE id = :post_id",
+        'unpinPost': "UPDATE hive_posts SET is_pinned = '0' WHERE id = :post_id",
+    }
+
     def __init__(self, actor, date):
         """Inits a community op for validation and processing."""
         self.date = date
@@ -339,7 +424,6 @@ class CommunityOp:
     def process(self):
         """Applies a validated operation."""
         assert self.valid, 'cannot apply invalid op'
-        from hive.indexer.cached_post import CachedPost
 
         action = self.action
         params = dict(
@@ -356,6 +440,10 @@ class CommunityOp:
             title=self.title,
         )
 
+        sql = self.ACTION_SQL.get(action)
+        if sql:
+            DB.query(sql, **params)
+
         # Community-level commands
         if action == 'updateProps':
             bind = ', '.join([k+" = :"+k for k in list(self.props.keys())])
@@ -364,59 +452,29 @@ class CommunityOp:
             self._notify('set_props', payload=json.dumps(read_key_dict(self.op, 'props')))
 
         elif action == 'subscribe':
-            DB.query("""INSERT INTO hive_subscriptions
-                               (account_id, community_id, created_at)
-                        VALUES (:actor_id, :community_id, :date)""", **params)
-            DB.query("""UPDATE hive_communities
-                           SET subscribers = subscribers + 1
-                         WHERE id = :community_id""", **params)
             self._notify('subscribe')
-        elif action == 'unsubscribe':
-            DB.query("""DELETE FROM hive_subscriptions
-                         WHERE account_id = :actor_id
-                           AND community_id = :community_id""", **params)
-            DB.query("""UPDATE hive_communities
-                           SET subscribers = subscribers - 1
-                         WHERE id = :community_id""", **params)
 
         # Account-level actions
         elif action == 'setRole':
-            DB.query("""INSERT INTO hive_roles
-                               (account_id, community_id, role_id, created_at)
-                        VALUES (:account_id, :community_id, :role_id, :date)
-                            ON CONFLICT (account_id, community_id)
-                            DO UPDATE SET role_id = :role_id""", **params)
+            Community._set_user_role(self.community_id, self.account_id, self.role_id)
             self._notify('set_role', payload=Role(self.role_id).name)
         elif action == 'setUserTitle':
-            DB.query("""INSERT INTO hive_roles
-                               (account_id, community_id, title, created_at)
-                        VALUES (:account_id, :community_id, :title, :date)
-                            ON CONFLICT (account_id, community_id)
-                            DO UPDATE SET title = :title""", **params)
             self._notify('set_label', payload=self.title)
 
         # Post-level actions
         elif action == 'mutePost':
-            DB.query("""UPDATE hive_posts SET is_muted = '1'
-                         WHERE id = :post_id""", **params)
             self._notify('mute_post', payload=self.notes)
             if not DbState.is_initial_sync():
                 CachedPost.update(self.account, self.permlink, self.post_id)
 
         elif action == 'unmutePost':
-            DB.query("""UPDATE hive_posts SET is_muted = '0'
-                         WHERE id = :post_id""", **params)
             self._notify('unmute_post', payload=self.notes)
             if not DbState.is_initial_sync():
                 CachedPost.update(self.account, self.permlink, self.post_id)
 
         elif action == 'pinPost':
-            DB.query("""UPDATE hive_posts SET is_pinned = '1'
-                         WHERE id = :post_id""", **params)
             self._notify('pin_post', payload=self.notes)
         elif action == 'unpinPost':
-            DB.query("""UPDATE hive_posts SET is_pinned = '0'
-                         WHERE id = :post_id""", **params)
             self._notify('unpin_post', payload=self.notes)
         elif action == 'flagPost':
             self._notify('flag_post', payload=self.notes)
@@ -447,12 +505,12 @@ class CommunityOp:
         assert len(raw_op) == 2, 'op json must have 2 elements'
         assert isinstance(raw_op[0], str), 'op json[0] must be string'
         assert isinstance(raw_op[1], dict), 'op json[1] must be dict'
-        assert raw_op[0] in self.SCHEMA.keys(), 'invalid action'
+        assert raw_op[0] in self.SCHEMA, 'invalid action'
         return (raw_op[0], raw_op[1])
 
     def _read_schema(self):
         """Validate structure; read and validate keys."""
-        schema = self.SCHEMA[self.action]
+        schema = self.SCHEMA_KEYS[self.action]
         assert_keys_match(self.op.keys(), schema, allow_missing=False)
         if 'community' in schema: self._read_community()
         if 'account'   in schema: self._read_account()
@@ -483,8 +541,7 @@ class CommunityOp:
         _permlink = read_key_str(self.op, 'permlink', 256)
         assert _permlink, 'must name a permlink'
 
-        from hive.indexer.posts import Posts
-        _pid = Posts.get_id(self.account, _permlink)
+        _pid = _posts().get_id(self.account, _permlink)
         assert _pid, 'invalid post: %s/%s' % (self.account, _permlink)
 
         sql = """SELECT community_id FROM hive_posts WHERE id = :id LIMIT 1"""
@@ -514,9 +571,7 @@ class CommunityOp:
     def _read_props(self):
         # TODO: assert props changed?
         props = read_key_dict(self.op, 'props')
-        valid = ['title', 'about', 'lang', 'is_nsfw',
-                 'description', 'flag_text', 'settings']
-        assert_keys_match(props.keys(), valid, allow_missing=True)
+        assert_keys_match(props.keys(), self.PROPS_KEYS, allow_missing=True)
 
         out = {}
         if 'title' in props:
@@ -547,6 +602,15 @@ class CommunityOp:
     def _validate_permissions(self):
         community_id = self.community_id
         action = self.action
+
+        # subscriptions do not depend on actor's role
+        if action == 'subscribe':
+            assert not self._subscribed(self.actor_id), 'already subscribed'
+            return
+        if action == 'unsubscribe':
+            assert self._subscribed(self.actor_id), 'already unsubscribed'
+            return
+
         actor_role = Community.get_user_role(community_id, self.actor_id)
         new_role = self.role_id
 
@@ -578,10 +642,6 @@ class CommunityOp:
         elif action == 'flagPost':
             assert actor_role > Role.muted, 'muted users cannot flag posts'
             assert not self._flagged(), 'user already flagged this post'
-        elif action == 'subscribe':
-            assert not self._subscribed(self.actor_id), 'already subscribed'
-        elif action == 'unsubscribe':
-            assert self._subscribed(self.actor_id), 'already unsubscribed'
 
     def _subscribed(self, account_id):
         """Check an account's subscription status."""
@@ -609,7 +669,6 @@ class CommunityOp:
 
     def _flagged(self):
         """Check user's flag status."""
-        from hive.indexer.notify import NotifyType
         sql = """SELECT 1 FROM hive_notifs
                   WHERE community_id = :community_id
                     AND post_id = :post_id
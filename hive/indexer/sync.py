@@ -2,12 +2,13 @@
 
 import logging
 import glob
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from time import perf_counter as perf
 import os
 import ujson as json
 
 from funcy.seqs import drop
-from toolz import partition_all
 
 from hive.db.db_state import DbState
 
@@ -16,7 +17,7 @@ from hive.steem.block.stream import MicroForkException
 
 from hive.indexer.blocks import Blocks
 from hive.indexer.accounts import Accounts
-from hive.indexer.cached_post import CachedPost
+from hive.indexer.cached_post import CachedPost, LEVELS
 from hive.indexer.feed_cache import FeedCache
 from hive.indexer.follow import Follow
 from hive.indexer.community import Community
@@ -26,12 +27,61 @@ from hive.server.common.mutes import Mutes
 
 log = logging.getLogger(__name__)
 
+# checkpoint line-offset index: one byte offset per this many lines
+CHECKPOINT_IDX_STEP = 1000
+
+def _checkpoint_index(f, path):
+    """Load (or build and save) byte offsets of every Nth line of `f`."""
+    idx_path = path + '.idx'
+    offsets = array('Q')
+    if os.path.exists(idx_path):
+        try:
+            with open(idx_path, 'rb') as idx:
+                offsets.frombytes(idx.read())
+        except (OSError, ValueError) as e:
+            # unreadable or truncated mid-entry; caller scans linearly
+            log.warning("[SYNC] ignoring bad index %s: %s", idx_path, repr(e))
+            return array('Q')
+        return offsets
+
+    log.info("[SYNC] Indexing %s", path)
+    f.seek(0)
+    pos = 0
+    for i, line in enumerate(f):
+        if i % CHECKPOINT_IDX_STEP == 0:
+            offsets.append(pos)
+        pos += len(line)
+    try:
+        with open(idx_path, 'wb') as idx:
+            offsets.tofile(idx)
+    except OSError as e:
+        log.warning("[SYNC] could not save %s: %s", idx_path, repr(e))
+    return offsets
+
+def _skip_lines(f, path, count):
+    """Position binary file `f` after its first `count` lines."""
+    offsets = _checkpoint_index(f, path) if count else None
+    if offsets:
+        anchor = min(count // CHECKPOINT_IDX_STEP, len(offsets) - 1)
+        f.seek(offsets[anchor])
+        count -= anchor * CHECKPOINT_IDX_STEP
+    else:
+        f.seek(0)
+    return drop(count, f)
+
 class Sync:
     """Manages the sync/index process.
 
     Responsible for initial sync, fast sync, and listen (block-follow).
     """
 
+    # In live mode, write post cache updates every n blocks (if trailing).
+    # Blocks commit ahead of their queued post cache updates, which are
+    # held in memory only: `listen` flushes them on any exit it sees, but
+    # a hard kill loses edits/votes of up to n-1 committed blocks (new
+    # posts are restored by `recover_missing_posts` on restart).
+    POST_FLUSH_BLOCKS = 3
+
     def __init__(self, conf):
         self._conf = conf
         self._db = conf.db()
@@ -106,14 +156,15 @@ class Sync:
         FeedCache.rebuild()
         Follow.force_recount()
 
-    def from_checkpoints(self, chunk_size=1000):
+    def from_checkpoints(self, chunk_size=1000, commit_size=10000):
         """Initial sync strategy: read from blocks on disk.
 
         This methods scans for files matching ./checkpoints/*.json.lst
         and uses them for hive's initial sync. Each line must contain
-        exactly one block in JSON format.
+        exactly one block in JSON format. Blocks are processed in batches
+        of `chunk_size` and committed every `commit_size` blocks.
         """
-        # pylint: disable=no-self-use
+        commit_every = max(1, commit_size // chunk_size)
         last_block = Blocks.head_num()
 
         tuplize = lambda path: [int(path.split('/')[-1].split('.')[0]), path]
@@ -125,13 +176,28 @@ class Sync:
         for (num, path) in tuples:
             if last_block < num:
                 log.info("[SYNC] Load %s. Last block: %d", path, last_block)
-                with open(path) as f:
+                # read raw bytes; ujson parses utf-8 without a str copy
+                with open(path, 'rb') as f:
                     # each line in file represents one block
                     # we can skip the blocks we already have
                     skip_lines = last_block - last_read
-                    remaining = drop(skip_lines, f)
-                    for lines in partition_all(chunk_size, remaining):
-                        Blocks.process_multi(map(json.loads, lines), True)
+                    remaining = _skip_lines(f, path, skip_lines)
+                    self._db.query("START TRANSACTION")
+                    batches = 0
+                    buf = []
+                    add = buf.append
+                    for line in remaining:
+                        add(json.loads(line))
+                        if len(buf) == chunk_size:
+                            Blocks.process_multi(buf, True, trx=False)
+                            buf.clear()
+                            batches += 1
+                            if batches % commit_every == 0:
+                                self._db.query("COMMIT")
+                                self._db.query("START TRANSACTION")
+                    if buf:
+                        Blocks.process_multi(buf, True, trx=False)
+                    self._db.query("COMMIT")
                 last_block = num
             last_read = num
 
@@ -147,22 +213,29 @@ class Sync:
 
         log.info("[SYNC] start block %d, +%d to sync", lbound, count)
         timer = Timer(count, entity='block', laps=['rps', 'wps'])
-        while lbound < ubound:
-            timer.batch_start()
 
-            # fetch blocks
+        # fetch the next chunk in the background while processing the current
+        with ThreadPoolExecutor(max_workers=1) as executor:
             to = min(lbound + chunk_size, ubound)
-            blocks = steemd.get_blocks_range(lbound, to)
-            lbound = to
-            timer.batch_lap()
-
-            # process blocks
-            Blocks.process_multi(blocks, is_initial_sync)
-            timer.batch_finish(len(blocks))
-
-            _prefix = ("[SYNC] Got block %d @ %s" % (
-                to - 1, blocks[-1]['timestamp']))
-            log.info(timer.batch_status(_prefix))
+            pending = executor.submit(steemd.get_blocks_range, lbound, to)
+            while lbound < ubound:
+                timer.batch_start()
+
+                # wait for prefetched blocks, then request the next chunk
+                blocks = pending.result()
+                lbound = to
+                if lbound < ubound:
+                    to = min(lbound + chunk_size, ubound)
+                    pending = executor.submit(steemd.get_blocks_range, lbound, to)
+                timer.batch_lap()
+
+                # process blocks
+                Blocks.process_multi(blocks, is_initial_sync)
+                timer.batch_finish(len(blocks))
+
+                _prefix = ("[SYNC] Got block %d @ %s" % (
+                    lbound - 1, blocks[-1]['timestamp']))
+                log.info(timer.batch_status(_prefix))
 
         if not is_initial_sync:
             # This flush is low importance; accounts are swept regularly.
@@ -183,39 +256,67 @@ class Sync:
         # debug: no max gap if disable_sync in effect
         max_gap = None if self._conf.get('test_disable_sync') else 100
 
+        # batch post cache fetches over a few blocks, unless the
+        # operator asked for zero lag
+        flush_every = self.POST_FLUSH_BLOCKS if trail_blocks else 1
+        no_posts = dict.fromkeys(LEVELS, 0)
+
         steemd = self._steem
         hive_head = Blocks.head_num()
-
-        for block in steemd.stream_blocks(hive_head + 1, trail_blocks, max_gap):
-            start_time = perf()
-
-            self._db.query("START TRANSACTION")
-            num = Blocks.process(block)
-            follows = Follow.flush(trx=False)
-            accts = Accounts.flush(steemd, trx=False, spread=8)
-            CachedPost.dirty_paidouts(block['timestamp'])
-            cnt = CachedPost.flush(steemd, trx=False)
-            self._db.query("COMMIT")
-
-            ms = (perf() - start_time) * 1000
-            log.info("[LIVE] Got block %d at %s --% 4d txs,% 3d posts,% 3d edits,"
-                     "% 3d payouts,% 3d votes,% 3d counts,% 3d accts,% 3d follows"
-                     " --% 5dms%s", num, block['timestamp'], len(block['transactions']),
-                     cnt['insert'], cnt['update'], cnt['payout'], cnt['upvote'],
-                     cnt['recount'], accts, follows, ms, ' SLOW' if ms > 1000 else '')
-
-            if num % 1200 == 0: #1hr
-                log.warning("head block %d @ %s", num, block['timestamp'])
-                log.info("[LIVE] hourly stats")
-                Accounts.fetch_ranks()
-                #Community.recalc_pending_payouts()
-            if num % 200 == 0: #10min
-                Community.recalc_pending_payouts()
-            if num % 100 == 0: #5min
-                log.info("[LIVE] 5-min stats")
-                Accounts.dirty_oldest(500)
-            if num % 20 == 0: #1min
-                self._update_chain_state()
+        pending = 0 # committed blocks w/ unflushed post cache updates
+
+        try:
+            for block in steemd.stream_blocks(hive_head + 1, trail_blocks, max_gap):
+                start_time = perf()
+
+                self._db.query("START TRANSACTION")
+                num = Blocks.process(block)
+                follows = Follow.flush(trx=False)
+                accts = Accounts.flush(steemd, trx=False, spread=8)
+                CachedPost.dirty_paidouts(block['timestamp'])
+                pending += 1
+                if pending >= flush_every:
+                    cnt = CachedPost.flush(steemd, trx=False)
+                    pending = 0
+                else:
+                    cnt = no_posts
+                self._db.query("COMMIT")
+
+                ms = (perf() - start_time) * 1000
+                log.info("[LIVE] Got block %d at %s --% 4d txs,% 3d posts,% 3d edits,"
+                         "% 3d payouts,% 3d votes,% 3d counts,% 3d accts,% 3d follows"
+                         " --% 5dms%s", num, block['timestamp'], len(block['transactions']),
+                         cnt['insert'], cnt['update'], cnt['payout'], cnt['upvote'],
+                         cnt['recount'], accts, follows, ms, ' SLOW' if ms > 1000 else '')
+
+                if num % 1200 == 0: #1hr
+                    log.warning("head block %d @ %s", num, block['timestamp'])
+                    log.info("[LIVE] hourly stats")
+                    Accounts.fetch_ranks()
+                    #Community.recalc_pending_payouts()
+                if num % 200 == 0: #10min
+                    Community.recalc_pending_payouts()
+                if num % 100 == 0: #5min
+                    log.info("[LIVE] 5-min stats")
+                    Accounts.dirty_oldest(500)
+                if num % 20 == 0: #1min
+                    self._update_chain_state()
+        finally:
+            if pending:
+                self._flush_pending_posts(pending)
+
+    def _flush_pending_posts(self, pending):
+        """Write post cache updates queued by the last `pending` blocks."""
+        if self._db.is_trx_active():
+            # interrupted mid-block; that block was not committed, but
+            # the updates queued by earlier committed blocks are lost
+            log.warning("[LIVE] dropping post cache updates of up to %d blocks",
+                        pending)
+            return
+        try:
+            CachedPost.flush(self._steem, trx=True)
+        except Exception as e: # pylint: disable=broad-except
+            log.error("[LIVE] post cache flush on exit failed: %s", repr(e))
 
     # refetch dynamic_global_properties, feed price, etc
     def _update_chain_state(self):
@@ -228,5 +329,5 @@ class Sync:
                        spm=state['steem_per_mvest'],
                        ups=state['usd_per_steem'],
                        sps=state['sbd_per_steem'],
-                       dgpo=json.dumps(state['dgpo']))
+                       dgpo=json.dumps(state['dgpo'], ensure_ascii=False))
         return state['dgpo']['head_block_number']
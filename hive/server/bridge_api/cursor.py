@@ -1,7 +1,11 @@
 """Cursor-based pagination queries, mostly supporting bridge_api."""
 
+import asyncio
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
+from aiocache import cached
+
+from hive.server.common.accounts import get_account_id
 
 # pylint: disable=too-many-lines
 
@@ -19,23 +23,24 @@ async def _get_post_id(db, author, permlink):
     assert post_id, 'invalid author/permlink'
     return post_id
 
-async def _get_account_id(db, name):
-    """Get account id from hive db."""
-    assert name, 'no account name specified'
-    _id = await db.query_one("SELECT id FROM hive_accounts WHERE name = :n", n=name)
-    assert _id, "account not found: `%s`" % name
-    return _id
-
 async def _get_community_id(db, name):
     """Get community id from hive db."""
     assert name, 'no comm name specified'
     _id = await db.query_one("SELECT id FROM hive_communities WHERE name = :n", n=name)
     return _id
 
+async def _none():
+    """Placeholder awaitable for an `asyncio.gather` slot with no lookup."""
+    return None
+
 #TODO: async def posts_by_ranked
+@cached(ttl=3, timeout=1200)
 async def pids_by_ranked(db, sort, start_author, start_permlink, limit, tag, observer_id=None):
     """Get a list of post_ids for a given posts query.
 
+    Results are shared across requests for a few seconds; callers must
+    not mutate the returned list.
+
     if `tag` is blank: global trending
     if `tag` is `my`: personal trending
     if `tag` is `hive-*`: community trending
@@ -48,25 +53,34 @@ async def pids_by_ranked(db, sort, start_author, start_permlink, limit, tag, obs
     # TODO: `payout` should limit to ~24hrs
     # pylint: disable=too-many-arguments
 
+    # no subscriptions: empty page, without resolving the start post
+    comm = None
+    if tag == 'my':
+        comm = await _subscribed(db, observer_id)
+        if not comm: return []
+
+    # community and start post lookups are independent; run them together
+    start = (_get_post_id(db, start_author, start_permlink)
+             if start_permlink else _none())
+    if tag[:5] == 'hive-':
+        comm, start_id = await asyncio.gather(_get_community_id(db, tag), start)
+    else:
+        start_id = await start
+
     # list of comm ids to query, if tag is comms key
     cids = None
     single = None
     if tag == 'my':
-        cids = await _subscribed(db, observer_id)
-        if not cids: return []
+        cids = comm
     elif tag == 'all':
         cids = []
     elif tag[:5] == 'hive-':
-        single = await _get_community_id(db, tag)
+        single = comm
         if single: cids = [single]
 
     # if tag was comms key, then no tag filter
     if cids is not None: tag = None
 
-    start_id = None
-    if start_permlink:
-        start_id = await _get_post_id(db, start_author, start_permlink)
-
     if cids is None:
         pids = await pids_by_category(db, tag, sort, start_id, limit)
     else:
@@ -250,14 +264,14 @@ async def hide_pids_by_ids(db, ids):
 
     sql = """SELECT post_id FROM hive_posts_status
               WHERE list_type = '1' 
-              AND post_id IN :ids"""
-    return await db.query_col(sql, ids=tuple(ids))
+              AND post_id = ANY(:ids)"""
+    return await db.query_col(sql, ids=list(ids))
 
 
 async def pids_by_blog(db, account: str, start_author: str = '',
                        start_permlink: str = '', limit: int = 20):
     """Get a list of post_ids for an author's blog."""
-    account_id = await _get_account_id(db, account)
+    account_id = await get_account_id(db, account)
 
     seek = ''
     start_id = None
@@ -312,8 +326,8 @@ async def pids_by_blog(db, account: str, start_author: str = '',
 
 async def pids_by_feed_with_reblog(db, account: str, start_author: str = '',
                                    start_permlink: str = '', limit: int = 20):
-    """Get a list of [post_id, reblogged_by_str] for an account's feed."""
-    account_id = await _get_account_id(db, account)
+    """Get a list of [post_id, reblogged_by] for an account's feed."""
+    account_id = await get_account_id(db, account)
 
     seek = ''
     start_id = None
@@ -330,15 +344,20 @@ async def pids_by_feed_with_reblog(db, account: str, start_author: str = '',
                                   AND state IN (1,3)))
         """
 
+    # reblogged_by excludes the post's author; it is {} (falsy) when empty
     sql = """
-        SELECT post_id, string_agg(name, ',') accounts
-          FROM hive_feed_cache
-          JOIN hive_follows ON account_id = hive_follows.following AND state IN (1,3)
-          JOIN hive_accounts ON hive_follows.following = hive_accounts.id
-         WHERE hive_follows.follower = :account
-           AND hive_feed_cache.created_at > :cutoff
-      GROUP BY post_id %s
-      ORDER BY MIN(hive_feed_cache.created_at) DESC LIMIT :limit
+        SELECT feed.post_id, array_remove(feed.accounts, hp.author) reblogged_by
+          FROM (SELECT post_id, array_agg(name) accounts,
+                       MIN(hive_feed_cache.created_at) created_at
+                  FROM hive_feed_cache
+                  JOIN hive_follows ON account_id = hive_follows.following AND state IN (1,3)
+                  JOIN hive_accounts ON hive_follows.following = hive_accounts.id
+                 WHERE hive_follows.follower = :account
+                   AND hive_feed_cache.created_at > :cutoff
+              GROUP BY post_id %s
+              ORDER BY MIN(hive_feed_cache.created_at) DESC LIMIT :limit) feed
+          JOIN hive_posts hp ON hp.id = feed.post_id
+      ORDER BY feed.created_at DESC
     """ % seek
 
     result = await db.query_all(sql, account=account_id, start_id=start_id,
@@ -404,42 +423,38 @@ async def pids_by_replies(db, start_author: str, start_permlink: str = '',
     account being replied to. For successive pages, provide the
     last loaded reply's author/permlink.
     """
-    seek = ''
-    start_id = None
     if start_permlink:
-        sql = """
-          SELECT parent.author,
-                 child.id
-            FROM hive_posts child
-            JOIN hive_posts parent
-              ON child.parent_id = parent.id
-           WHERE child.author = :author
-             AND child.permlink = :permlink
+        # resolve the cursor reply and its parent's author in the same
+        # statement; an unknown cursor matches no rows
+        start = """
+          WITH start AS (
+            SELECT parent.author,
+                   child.id
+              FROM hive_posts child
+              JOIN hive_posts parent
+                ON child.parent_id = parent.id
+             WHERE child.author = :author
+               AND child.permlink = :permlink)
         """
-
-        row = await db.query_row(sql, author=start_author, permlink=start_permlink)
-        if not row:
-            return []
-
-        parent_account = row[0]
-        start_id = row[1]
-        seek = "AND id <= :start_id"
+        parent = "(SELECT author FROM start)"
+        seek = "AND id <= (SELECT id FROM start)"
     else:
-        parent_account = start_author
+        start, parent, seek = '', ':author', ''
 
-    sql = """
+    sql = start + """
        SELECT id FROM hive_posts
         WHERE parent_id IN (SELECT id FROM hive_posts
-                             WHERE author = :parent
+                             WHERE author = %s
                                AND is_deleted = '0'
                           ORDER BY id DESC
                              LIMIT 10000) %s
           AND is_deleted = '0'
      ORDER BY id DESC
         LIMIT :limit
-    """ % seek
+    """ % (parent, seek)
 
-    return await db.query_col(sql, parent=parent_account, start_id=start_id, limit=limit)
+    return await db.query_col(sql, author=start_author, permlink=start_permlink,
+                              limit=limit)
 
 async def pids_by_payout(db, account: str, start_author: str = '',
                          start_permlink: str = '', limit: int = 20):
@@ -28,27 +28,30 @@ async def load_posts_reblogs(db, ids_with_reblogs, truncate_body=0):
 
     # Merge reblogged_by data into result set
     for post in posts:
-        rby = set(reblog_by[post['post_id']].split(','))
-        rby.discard(post['author'])
+        rby = reblog_by[post['post_id']]
         if rby:
-            post['reblogged_by'] = list(rby)
+            post['reblogged_by'] = rby
 
     return posts
 
 ROLES = {-2: 'muted', 0: 'guest', 2: 'member', 4: 'mod', 6: 'admin', 8: 'owner'}
 
 async def load_posts_keyed(db, ids, truncate_body=0):
-    """Given an array of post ids, returns full posts objects keyed by id."""
+    """Given an array of post ids, returns full posts objects keyed by id.
+
+    Keys are in input order (missing posts are skipped)."""
     # pylint: disable=too-many-locals
     assert ids, 'no ids passed to load_posts_keyed'
 
-    # fetch posts and associated author reps
+    # fetch posts and associated author reps, in input order
     sql = """SELECT post_id, community_id, author, permlink, title, body, category, depth,
                     promoted, payout, payout_at, is_paidout, children, votes,
                     created_at, updated_at, rshares, raw_json, json,
                     is_hidden, is_grayed, total_votes, flag_weight
-               FROM hive_posts_cache WHERE post_id IN :ids"""
-    result = await db.query_all(sql, ids=tuple(ids))
+               FROM unnest(CAST(:ids AS integer[])) WITH ORDINALITY AS u(id, ord)
+               JOIN hive_posts_cache ON post_id = u.id
+           ORDER BY u.ord"""
+    result = await db.query_all(sql, ids=list(ids))
     author_map = await _query_author_map(db, result)
 
     # TODO: author affiliation?
@@ -57,12 +60,11 @@ async def load_posts_keyed(db, ids, truncate_body=0):
     author_ids = {}
     post_cids = {}
     for row in result:
-        row = dict(row)
         author = author_map[row['author']]
         author_ids[author['id']] = author['name']
 
-        row['author_rep'] = author['reputation']
-        post = _condenser_post_object(row, truncate_body=truncate_body)
+        post = _condenser_post_object(row, author['reputation'],
+                                      truncate_body=truncate_body)
 
         post['blacklists'] = Mutes.lists(post['author'], author['reputation'])
 
@@ -107,8 +109,8 @@ async def load_posts_keyed(db, ids, truncate_body=0):
 
 
     sql = """SELECT id FROM hive_posts
-              WHERE id IN :ids AND is_pinned = '1' AND is_deleted = '0'"""
-    for pid in await db.query_col(sql, ids=tuple(ids)):
+              WHERE id = ANY(:ids) AND is_pinned = '1' AND is_deleted = '0'"""
+    for pid in await db.query_col(sql, ids=list(ids)):
         if pid in posts_by_id:
             posts_by_id[pid]['stats']['is_pinned'] = True
 
@@ -119,15 +121,14 @@ async def load_posts(db, ids, truncate_body=0):
     if not ids:
         return []
 
-    # posts are keyed by id so we can return output sorted by input order
+    # keyed in input order; missing posts are simply absent
     posts_by_id = await load_posts_keyed(db, ids, truncate_body=truncate_body)
 
-    # in rare cases of cache inconsistency, recover and warn
-    missed = set(ids) - posts_by_id.keys()
+    # in rare cases of cache inconsistency, warn
+    missed = set(ids) - posts_by_id.keys() if len(posts_by_id) < len(ids) else None
     if missed:
         log.info("get_posts do not exist in cache: %s", repr(missed))
         for _id in missed:
-            ids.remove(_id)
             sql = ("SELECT id, author, permlink, depth, created_at, is_deleted "
                    "FROM hive_posts WHERE id = :id")
             post = await db.query_row(sql, id=_id)
@@ -137,7 +138,7 @@ async def load_posts(db, ids, truncate_body=0):
             else:
                 log.info("requested deleted post: %s", dict(post))
 
-    return [posts_by_id[_id] for _id in ids]
+    return list(posts_by_id.values())
 
 async def _query_author_map(db, posts):
     """Given a list of posts, returns an author->reputation map."""
@@ -174,19 +175,20 @@ def _condenser_profile_object(row):
                         'profile_image': row['profile_image'],
                        }}}
 
-def _condenser_post_object(row, truncate_body=0):
-    """Given a hive_posts_cache row, create a legacy-style post object."""
+def _condenser_post_object(row, author_rep, truncate_body=0):
+    """Given a hive_posts_cache row, create a legacy-style post object.
+
+    Only reads `row`, so db rows can be passed without copying."""
     paid = row['is_paidout']
 
     # condenser#3424 mitigation
-    if not row['category']:
-        row['category'] = 'undefined'
+    category = row['category'] or 'undefined'
 
     post = {}
     post['post_id'] = row['post_id']
     post['author'] = row['author']
     post['permlink'] = row['permlink']
-    post['category'] = row['category']
+    post['category'] = category
 
     post['title'] = row['title']
     post['body'] = row['body'][0:truncate_body] if truncate_body else row['body']
@@ -208,7 +210,7 @@ def _condenser_post_object(row, truncate_body=0):
 
     post['replies'] = []
     post['active_votes'] = _hydrate_active_votes(row['votes'])
-    post['author_reputation'] = row['author_rep']
+    post['author_reputation'] = author_rep
 
     post['stats'] = {
         'hide': row['is_hidden'],
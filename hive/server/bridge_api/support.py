@@ -79,8 +79,7 @@ async def normalize_post(context, post):
     ret = None
     try:
         if 'promoted' not in row: row['promoted'] = 0
-        row['author_rep'] = author['reputation']
-        ret = _condenser_post_object(row)
+        ret = _condenser_post_object(row, author['reputation'])
     except Exception as e:
         log.error("post_to_internal: %s %s", repr(e), traceback.format_exc())
         raise e
@@ -58,12 +58,12 @@ async def _child_ids(db, parent_ids):
     sql = """
              SELECT parent_id, array_agg(id)
                FROM hive_posts
-              WHERE parent_id IN :ids
+              WHERE parent_id = ANY(:ids)
                 AND is_deleted = '0'
                 AND author NOT IN (%s)
            GROUP BY parent_id
     """ % hide
-    rows = await db.query_all(sql, ids=tuple(parent_ids))
+    rows = await db.query_all(sql, ids=list(parent_ids))
     return [[row[0], row[1]] for row in rows]
 
 async def _load_discussion(db, root_id):
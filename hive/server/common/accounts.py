@@ -0,0 +1,22 @@
+"""Account lookups shared by server api modules."""
+
+from collections import OrderedDict
+
+# account name -> id; ids never change once assigned, so no expiry,
+# just a size bound with least-recently-used eviction
+_ACCOUNT_IDS = OrderedDict()
+_ACCOUNT_IDS_MAX = 50000
+
+async def get_account_id(db, name):
+    """Get account id from hive db."""
+    assert name, 'no account name specified'
+    _id = _ACCOUNT_IDS.get(name)
+    if _id:
+        _ACCOUNT_IDS.move_to_end(name)
+        return _id
+    _id = await db.query_one("SELECT id FROM hive_accounts WHERE name = :n", n=name)
+    assert _id, "account not found: `%s`" % name
+    _ACCOUNT_IDS[name] = _id
+    if len(_ACCOUNT_IDS) > _ACCOUNT_IDS_MAX:
+        _ACCOUNT_IDS.popitem(last=False)
+    return _id
@@ -1,12 +1,21 @@
 """Helpers for server/API functions."""
 
-import re
+from datetime import datetime
 from functools import wraps
 import traceback
 import logging
 
 log = logging.getLogger(__name__)
 
+# validation sets; charset checks use frozenset.issuperset, which is
+# faster than a regex or a str.translate table on short names and tags
+VALID_ACCOUNT_CHARS = frozenset('abcdefghijklmnopqrstuvwxyz0123456789-.')
+VALID_TAG_CHARS = frozenset('abcdefghijklmnopqrstuvwxyz0123456789-_')
+# TODO: differentiate valid sorts on comm vs tag
+VALID_SORTS = frozenset(['trending', 'promoted', 'hot', 'created',
+                         'payout', 'payout_comments', 'muted'])
+VALID_FOLLOW_TYPES = frozenset(['blog', 'ignore'])
+
 class ApiError(Exception):
     """API-specific errors: unimplemented/bad params. Pass back to client."""
     # pylint: disable=unnecessary-pass
@@ -49,8 +58,10 @@ def return_error_info(function):
     return wrapper
 
 def json_date(date=None):
-    """Given a db datetime, return a steemd/json-friendly version."""
+    """Given a db datetime or steemd timestamp string, return a
+    steemd/json-friendly version."""
     if not date: return '1969-12-31T23:59:59'
+    if isinstance(date, datetime): return date.isoformat()
     return 'T'.join(str(date).split(' '))
 
 def valid_account(name, allow_empty=False):
@@ -61,7 +72,7 @@ def valid_account(name, allow_empty=False):
     assert isinstance(name, str), "invalid account name type"
     assert 3 <= len(name) <= 16, "invalid account name length: `%s`" % name
     assert name[0] != '@', "invalid account name char `@`"
-    assert re.match(r'^[a-z0-9-\.]+$', name), 'invalid account char'
+    assert VALID_ACCOUNT_CHARS.issuperset(name), 'invalid account char'
     return name
 
 def valid_permlink(permlink, allow_empty=False):
@@ -79,10 +90,7 @@ def valid_sort(sort, allow_empty=False):
         assert allow_empty, 'sort must be specified'
         return ""
     assert isinstance(sort, str), 'sort must be a string'
-    # TODO: differentiate valid sorts on comm vs tag
-    valid_sorts = ['trending', 'promoted', 'hot', 'created',
-                   'payout', 'payout_comments', 'muted']
-    assert sort in valid_sorts, 'invalid sort `%s`' % sort
+    assert sort in VALID_SORTS, 'invalid sort `%s`' % sort
     return sort
 
 def valid_tag(tag, allow_empty=False):
@@ -91,7 +99,7 @@ def valid_tag(tag, allow_empty=False):
         assert allow_empty, 'tag was blank'
         return ""
     assert isinstance(tag, str), 'tag must be a string'
-    assert re.match('^[a-z0-9-_]+$', tag), 'invalid tag `%s`' % tag
+    assert VALID_TAG_CHARS.issuperset(tag), 'invalid tag `%s`' % tag
     return tag
 
 def valid_limit(limit, ubound=100):
@@ -112,5 +120,6 @@ def valid_offset(offset, ubound=None):
 
 def valid_follow_type(follow_type: str):
     """Ensure follow type is valid steemd type."""
-    assert follow_type in ['blog', 'ignore'], 'invalid follow_type `%s`' % follow_type
+    assert isinstance(follow_type, str), 'follow_type must be a string'
+    assert follow_type in VALID_FOLLOW_TYPES, 'invalid follow_type `%s`' % follow_type
     return follow_type
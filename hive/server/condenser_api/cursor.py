@@ -2,7 +2,9 @@
 
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
+from aiocache import cached
 
+from hive.server.common.accounts import get_account_id
 from hive.utils.normalize import rep_to_raw
 
 # pylint: disable=too-many-lines
@@ -11,6 +13,13 @@ def last_month():
     """Get the date 1 month ago."""
     return datetime.now() + relativedelta(months=-1)
 
+# Inline cursor lookups for seek clauses. An unknown cursor yields NULL,
+# which matches no rows -- same as the former "return []" early exits.
+_START_POST_ID = """(SELECT id FROM hive_posts
+                      WHERE author = :start_author
+                        AND permlink = :start_permlink)"""
+_START_ACCOUNT_ID = "(SELECT id FROM hive_accounts WHERE name = :start)"
+
 async def get_post_id(db, author, permlink):
     """Given an author/permlink, retrieve the id from db."""
     sql = ("SELECT id FROM hive_posts WHERE author = :a "
@@ -27,50 +36,44 @@ async def _get_post_id(db, author, permlink):
     sql = "SELECT id FROM hive_posts WHERE author = :a AND permlink = :p"
     return await db.query_one(sql, a=author, p=permlink)
 
-async def _get_account_id(db, name):
-    """Get account id from hive db."""
-    assert name, 'no account name specified'
-    _id = await db.query_one("SELECT id FROM hive_accounts WHERE name = :n", n=name)
-    assert _id, "account not found: `%s`" % name
-    return _id
-
+# hive_follows states matched by each (validated) follow type
+_FOLLOW_STATES = {'blog': (1, 3), 'ignore': (2, 3)}
 
 async def get_followers(db, account: str, start: str, follow_type: str, limit: int):
     """Get a list of accounts following a given account."""
-    account_id = await _get_account_id(db, account)
-    start_id = await _get_account_id(db, start) if start else None
-    state = (2,3) if follow_type == 'ignore' else (1,3)
+    account_id = await get_account_id(db, account)
+    state = _FOLLOW_STATES[follow_type]
 
     seek = ''
-    if start_id:
+    if start:
         seek = """AND hf.created_at <= (
                      SELECT created_at FROM hive_follows
                       WHERE following = :account_id
-                        AND follower = :start_id)"""
+                        AND follower = %s)""" % _START_ACCOUNT_ID
 
     sql = """
-        SELECT name,reputation,state FROM hive_follows hf
-     LEFT JOIN hive_accounts ON hf.follower = id
+        SELECT ha.name, ha.reputation, hf.state FROM hive_follows hf
+     LEFT JOIN hive_accounts ha ON ha.id = hf.follower
          WHERE hf.following = :account_id
-           AND state IN :state %s
+           AND hf.state IN :state %s
       ORDER BY hf.created_at DESC
          LIMIT :limit
     """ % seek
 
-    return await db.query_all(sql, account_id=account_id, start_id=start_id,
+    return await db.query_all(sql, account_id=account_id, start=start,
                               state=state, limit=limit)
 
 
 async def get_followers_by_page(db, account: str, page: int, page_size: int, follow_type: str):
     """Get a list of accounts following a given account."""
-    account_id = await _get_account_id(db, account)
-    state = (2,3) if follow_type == 'ignore' else (1,3)
+    account_id = await get_account_id(db, account)
+    state = _FOLLOW_STATES[follow_type]
 
     sql = """
-        SELECT name,reputation,state FROM hive_follows hf
-     LEFT JOIN hive_accounts ON hf.follower = id
+        SELECT ha.name, ha.reputation, hf.state FROM hive_follows hf
+     LEFT JOIN hive_accounts ha ON ha.id = hf.follower
          WHERE hf.following = :account_id
-           AND state IN :state
+           AND hf.state IN :state
       ORDER BY hf.created_at DESC
          LIMIT :limit OFFSET :offset
     """
@@ -80,40 +83,39 @@ async def get_followers_by_page(db, account: str, page: int, page_size: int, fol
 
 async def get_following(db, account: str, start: str, follow_type: str, limit: int):
     """Get a list of accounts followed by a given account."""
-    account_id = await _get_account_id(db, account)
-    start_id = await _get_account_id(db, start) if start else None
-    state = (2, 3) if follow_type == 'ignore' else (1, 3)
+    account_id = await get_account_id(db, account)
+    state = _FOLLOW_STATES[follow_type]
 
     seek = ''
-    if start_id:
+    if start:
         seek = """AND hf.created_at <= (
                      SELECT created_at FROM hive_follows
                       WHERE follower = :account_id
-                        AND following = :start_id)"""
+                        AND following = %s)""" % _START_ACCOUNT_ID
 
     sql = """
-        SELECT name,reputation,state FROM hive_follows hf
-     LEFT JOIN hive_accounts ON hf.following = id
+        SELECT ha.name, ha.reputation, hf.state FROM hive_follows hf
+     LEFT JOIN hive_accounts ha ON ha.id = hf.following
          WHERE hf.follower = :account_id
-           AND state IN :state %s
+           AND hf.state IN :state %s
       ORDER BY hf.created_at DESC
          LIMIT :limit
     """ % seek
 
-    return await db.query_all(sql, account_id=account_id, start_id=start_id,
+    return await db.query_all(sql, account_id=account_id, start=start,
                               state=state, limit=limit)
 
 
 async def get_following_by_page(db, account: str, page: int, page_size: int, follow_type: str):
     """Get a list of accounts followed by a given account."""
-    account_id = await _get_account_id(db, account)
-    state = (2, 3) if follow_type == 'ignore' else (1, 3)
+    account_id = await get_account_id(db, account)
+    state = _FOLLOW_STATES[follow_type]
 
     sql = """
-        SELECT name,reputation,state FROM hive_follows hf
-     LEFT JOIN hive_accounts ON hf.following = id
+        SELECT ha.name, ha.reputation, hf.state FROM hive_follows hf
+     LEFT JOIN hive_accounts ha ON ha.id = hf.following
          WHERE hf.follower = :account_id
-           AND state IN :state
+           AND hf.state IN :state
       ORDER BY hf.created_at DESC
          LIMIT :limit OFFSET :offset
     """
@@ -124,11 +126,12 @@ async def get_following_by_page(db, account: str, page: int, page_size: int, fol
 
 async def get_follow_counts(db, account: str):
     """Return following/followers count for `account`."""
-    account_id = await _get_account_id(db, account)
     sql = """SELECT following, followers
                FROM hive_accounts
-              WHERE id = :account_id"""
-    return dict(await db.query_row(sql, account_id=account_id))
+              WHERE name = :account"""
+    row = await db.query_row(sql, account=account)
+    assert row, "account not found: `%s`" % account
+    return dict(row)
 
 
 async def get_reblogged_by(db, author: str, permlink: str):
@@ -157,10 +160,14 @@ async def get_account_reputations(db, account_lower_bound, limit):
     return [dict(name=r[0], reputation=rep_to_raw(r[1])) for r in rows]
 
 
+@cached(ttl=3, timeout=1200)
 async def pids_by_query(db, sort, start_author, start_permlink, limit, tag):
     """Get a list of post_ids for a given posts query.
 
     `sort` can be trending, hot, created, promoted, payout, or payout_comments.
+
+    Results are shared across requests for a few seconds; callers must
+    not mutate the returned list.
     """
     # pylint: disable=too-many-arguments,bad-whitespace,line-too-long
     assert sort in ['trending', 'hot', 'created', 'promoted',
@@ -200,40 +207,33 @@ async def pids_by_query(db, sort, start_author, start_permlink, limit, tag):
             sql = "SELECT post_id FROM hive_post_tags WHERE tag = :tag"
             where.append("post_id IN (%s)" % sql)
 
-    start_id = None
     if start_permlink:
-        start_id = await _get_post_id(db, start_author, start_permlink)
-        if not start_id:
-            return []
-
-        sql = "%s <= (SELECT %s FROM %s WHERE post_id = :start_id)"
-        where.append(sql % (field, field, table))
+        # cursor value resolved in the same statement (index lookup as an
+        # initplan); an unknown start post yields NULL and no rows
+        sql = "%s <= (SELECT %s FROM %s WHERE post_id = %s)"
+        where.append(sql % (field, field, table, _START_POST_ID))
 
     sql = ("SELECT post_id FROM %s WHERE %s ORDER BY %s DESC LIMIT :limit"
            % (table, ' AND '.join(where), field))
 
-    return await db.query_col(sql, tag=tag, start_id=start_id, limit=limit)
+    return await db.query_col(sql, tag=tag, start_author=start_author,
+                              start_permlink=start_permlink, limit=limit)
 
 
 async def pids_by_blog(db, account: str, start_author: str = '',
                        start_permlink: str = '', limit: int = 20):
     """Get a list of post_ids for an author's blog."""
-    account_id = await _get_account_id(db, account)
+    account_id = await get_account_id(db, account)
 
     seek = ''
-    start_id = None
     if start_permlink:
-        start_id = await _get_post_id(db, start_author, start_permlink)
-        if not start_id:
-            return []
-
         seek = """
           AND created_at <= (
             SELECT created_at
               FROM hive_feed_cache
              WHERE account_id = :account_id
-               AND post_id = :start_id)
-        """
+               AND post_id = %s)
+        """ % _START_POST_ID
 
     sql = """
         SELECT post_id
@@ -243,7 +243,8 @@ async def pids_by_blog(db, account: str, start_author: str = '',
          LIMIT :limit
     """ % seek
 
-    return await db.query_col(sql, account_id=account_id, start_id=start_id, limit=limit)
+    return await db.query_col(sql, account_id=account_id, start_author=start_author,
+                              start_permlink=start_permlink, limit=limit)
 
 
 async def pids_by_blog_by_index(db, account: str, start_index: int, limit: int = 20):
@@ -256,7 +257,7 @@ async def pids_by_blog_by_index(db, account: str, start_index: int, limit: int =
     (acct, 2, 3) = returns 3 posts: idxs (2,1,0)
     """
 
-    account_id = await _get_account_id(db, account)
+    account_id = await get_account_id(db, account)
 
     if start_index in (-1, 0):
         sql = """SELECT COUNT(*) - 1 FROM hive_feed_cache
@@ -286,12 +287,8 @@ async def pids_by_blog_without_reblog(db, account: str, start_permlink: str = ''
     """Get a list of post_ids for an author's blog without reblogs."""
 
     seek = ''
-    start_id = None
     if start_permlink:
-        start_id = await _get_post_id(db, account, start_permlink)
-        if not start_id:
-            return []
-        seek = "AND id <= :start_id"
+        seek = "AND id <= %s" % _START_POST_ID
 
     sql = """
         SELECT id
@@ -303,54 +300,51 @@ async def pids_by_blog_without_reblog(db, account: str, start_permlink: str = ''
          LIMIT :limit
     """ % seek
 
-    return await db.query_col(sql, account=account, start_id=start_id, limit=limit)
+    return await db.query_col(sql, account=account, start_author=account,
+                              start_permlink=start_permlink, limit=limit)
 
 
 async def pids_by_feed_with_reblog(db, account: str, start_author: str = '',
                                    start_permlink: str = '', limit: int = 20):
-    """Get a list of [post_id, reblogged_by_str] for an account's feed."""
-    account_id = await _get_account_id(db, account)
+    """Get a list of [post_id, reblogged_by] for an account's feed."""
+    account_id = await get_account_id(db, account)
 
     seek = ''
-    start_id = None
     if start_permlink:
-        start_id = await _get_post_id(db, start_author, start_permlink)
-        if not start_id:
-            return []
-
         seek = """
           HAVING MIN(hive_feed_cache.created_at) <= (
-            SELECT MIN(created_at) FROM hive_feed_cache WHERE post_id = :start_id
+            SELECT MIN(created_at) FROM hive_feed_cache WHERE post_id = %s
                AND account_id IN (SELECT following FROM hive_follows
                                   WHERE follower = :account AND state IN (1,3)))
-        """
+        """ % _START_POST_ID
 
+    # reblogged_by excludes the post's author; it is {} (falsy) when empty
     sql = """
-        SELECT post_id, string_agg(name, ',') accounts
-          FROM hive_feed_cache
-          JOIN hive_follows ON account_id = hive_follows.following AND state IN (1,3)
-          JOIN hive_accounts ON hive_follows.following = hive_accounts.id
-         WHERE hive_follows.follower = :account
-           AND hive_feed_cache.created_at > :cutoff
-      GROUP BY post_id %s
-      ORDER BY MIN(hive_feed_cache.created_at) DESC LIMIT :limit
+        SELECT feed.post_id, array_remove(feed.accounts, hp.author) reblogged_by
+          FROM (SELECT post_id, array_agg(name) accounts,
+                       MIN(hive_feed_cache.created_at) created_at
+                  FROM hive_feed_cache
+                  JOIN hive_follows ON account_id = hive_follows.following AND state IN (1,3)
+                  JOIN hive_accounts ON hive_follows.following = hive_accounts.id
+                 WHERE hive_follows.follower = :account
+                   AND hive_feed_cache.created_at > :cutoff
+              GROUP BY post_id %s
+              ORDER BY MIN(hive_feed_cache.created_at) DESC LIMIT :limit) feed
+          JOIN hive_posts hp ON hp.id = feed.post_id
+      ORDER BY feed.created_at DESC
     """ % seek
 
-    result = await db.query_all(sql, account=account_id, start_id=start_id,
-                                limit=limit, cutoff=last_month())
+    result = await db.query_all(sql, account=account_id, start_author=start_author,
+                                start_permlink=start_permlink, limit=limit,
+                                cutoff=last_month())
     return [(row[0], row[1]) for row in result]
 
 
 async def pids_by_account_comments(db, account: str, start_permlink: str = '', limit: int = 20):
     """Get a list of post_ids representing comments by an author."""
     seek = ''
-    start_id = None
     if start_permlink:
-        start_id = await _get_post_id(db, account, start_permlink)
-        if not start_id:
-            return []
-
-        seek = "AND id <= :start_id"
+        seek = "AND id <= %s" % _START_POST_ID
 
     # `depth` in ORDER BY is a no-op, but forces an ix3 index scan (see #189)
     sql = """
@@ -362,7 +356,8 @@ async def pids_by_account_comments(db, account: str, start_permlink: str = '', l
          LIMIT :limit
     """ % seek
 
-    return await db.query_col(sql, account=account, start_id=start_id, limit=limit)
+    return await db.query_col(sql, account=account, start_author=account,
+                              start_permlink=start_permlink, limit=limit)
 
 
 async def pids_by_replies_to_account(db, start_author: str, start_permlink: str = '',
@@ -373,39 +368,35 @@ async def pids_by_replies_to_account(db, start_author: str, start_permlink: str
     account being replied to. For successive pages, provide the
     last loaded reply's author/permlink.
     """
-    seek = ''
-    start_id = None
     if start_permlink:
-        sql = """
-          SELECT parent.author,
-                 child.id
-            FROM hive_posts child
-            JOIN hive_posts parent
-              ON child.parent_id = parent.id
-           WHERE child.author = :author
-             AND child.permlink = :permlink
+        # resolve the cursor reply and its parent's author in the same
+        # statement; an unknown cursor matches no rows
+        start = """
+          WITH start AS (
+            SELECT parent.author,
+                   child.id
+              FROM hive_posts child
+              JOIN hive_posts parent
+                ON child.parent_id = parent.id
+             WHERE child.author = :author
+               AND child.permlink = :permlink)
         """
-
-        row = await db.query_row(sql, author=start_author, permlink=start_permlink)
-        if not row:
-            return []
-
-        parent_account = row[0]
-        start_id = row[1]
-        seek = "AND id <= :start_id"
+        parent = "(SELECT author FROM start)"
+        seek = "AND id <= (SELECT id FROM start)"
     else:
-        parent_account = start_author
+        start, parent, seek = '', ':author', ''
 
-    sql = """
+    sql = start + """
        SELECT id FROM hive_posts
         WHERE parent_id IN (SELECT id FROM hive_posts
-                             WHERE author = :parent
+                             WHERE author = %s
                                AND is_deleted = '0'
                           ORDER BY id DESC
                              LIMIT 10000) %s
           AND is_deleted = '0'
      ORDER BY id DESC
         LIMIT :limit
-    """ % seek
+    """ % (parent, seek)
 
-    return await db.query_col(sql, parent=parent_account, start_id=start_id, limit=limit)
+    return await db.query_col(sql, author=start_author, permlink=start_permlink,
+                              limit=limit)
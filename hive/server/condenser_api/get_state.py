@@ -189,7 +189,8 @@ def _normalize_path(path):
     assert '#' not in path, 'path contains hash mark (#)'
     assert '?' not in path, 'path contains query string: `%s`' % path
 
-    parts = path.split('/')
+    # at most 3 parts (+ trailing slash); don't split any further
+    parts = path.split('/', 3)
     if len(parts) == 4 and parts[3] == '':
         parts = parts[:-1]
     assert len(parts) < 4, 'too many parts in path: `%s`' % path
@@ -227,11 +228,11 @@ async def _child_ids(db, parent_ids):
     sql = """
              SELECT parent_id, array_agg(id)
                FROM hive_posts
-              WHERE parent_id IN :ids
+              WHERE parent_id = ANY(:ids)
                 AND is_deleted = '0'
            GROUP BY parent_id
     """
-    rows = await db.query_all(sql, ids=tuple(parent_ids))
+    rows = await db.query_all(sql, ids=list(parent_ids))
     return [[row[0], row[1]] for row in rows]
 
 async def _load_discussion(db, author, permlink):
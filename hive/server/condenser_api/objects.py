@@ -28,30 +28,33 @@ async def load_posts_reblogs(db, ids_with_reblogs, truncate_body=0):
 
     # Merge reblogged_by data into result set
     for post in posts:
-        rby = set(reblog_by[post['post_id']].split(','))
-        rby.discard(post['author'])
+        rby = reblog_by[post['post_id']]
         if rby:
-            post['reblogged_by'] = list(rby)
+            post['reblogged_by'] = rby
 
     return posts
 
 async def load_posts_keyed(db, ids, truncate_body=0):
-    """Given an array of post ids, returns full posts objects keyed by id."""
+    """Given an array of post ids, returns full posts objects keyed by id.
+
+    Keys are in input order (missing posts are skipped)."""
     assert ids, 'no ids passed to load_posts_keyed'
 
-    # fetch posts and associated author reps
-    sql = """SELECT post_id, author, permlink, title, body, category, depth,
-                    promoted, payout, payout_at, is_paidout, children, votes,
-                    created_at, updated_at, rshares, raw_json, json
-               FROM hive_posts_cache WHERE post_id IN :ids"""
-    result = await db.query_all(sql, ids=tuple(ids))
-    author_reps = await _query_author_rep_map(db, result)
+    # fetch posts and associated author reps, in input order
+    sql = """SELECT hp.post_id, hp.author, hp.permlink, hp.title, hp.body,
+                    hp.category, hp.depth, hp.promoted, hp.payout, hp.payout_at,
+                    hp.is_paidout, hp.children, hp.votes, hp.created_at,
+                    hp.updated_at, hp.rshares, hp.raw_json, hp.json,
+                    ha.reputation AS author_rep
+               FROM unnest(CAST(:ids AS integer[])) WITH ORDINALITY AS u(id, ord)
+               JOIN hive_posts_cache hp ON hp.post_id = u.id
+               JOIN hive_accounts ha ON ha.name = hp.author
+           ORDER BY u.ord"""
+    result = await db.query_all(sql, ids=list(ids))
 
     muted_accounts = Mutes.all()
     posts_by_id = {}
     for row in result:
-        row = dict(row)
-        row['author_rep'] = author_reps[row['author']]
         post = _condenser_post_object(row, truncate_body=truncate_body)
         post['active_votes'] = _mute_votes(post['active_votes'], muted_accounts)
         posts_by_id[row['post_id']] = post
@@ -68,15 +71,14 @@ async def load_posts(db, ids, truncate_body=0):
     if not ids:
         return []
 
-    # posts are keyed by id so we can return output sorted by input order
+    # keyed in input order; missing posts are simply absent
     posts_by_id = await load_posts_keyed(db, ids, truncate_body=truncate_body)
 
-    # in rare cases of cache inconsistency, recover and warn
-    missed = set(ids) - posts_by_id.keys()
+    # in rare cases of cache inconsistency, warn
+    missed = set(ids) - posts_by_id.keys() if len(posts_by_id) < len(ids) else None
     if missed:
         log.info("get_posts do not exist in cache: %s", repr(missed))
         for _id in missed:
-            ids.remove(_id)
             sql = ("SELECT id, author, permlink, depth, created_at, is_deleted "
                    "FROM hive_posts WHERE id = :id")
             post = await db.query_row(sql, id=_id)
@@ -86,15 +88,7 @@ async def load_posts(db, ids, truncate_body=0):
             else:
                 log.info("requested deleted post: %s", dict(post))
 
-    return [posts_by_id[_id] for _id in ids]
-
-async def _query_author_rep_map(db, posts):
-    """Given a list of posts, returns an author->reputation map."""
-    if not posts:
-        return {}
-    names = tuple({post['author'] for post in posts})
-    sql = "SELECT name, reputation FROM hive_accounts WHERE name IN :names"
-    return {r['name']: r['reputation'] for r in await db.query_all(sql, names=names)}
+    return list(posts_by_id.values())
 
 def _condenser_account_object(row):
     """Convert an internal account record into legacy-steemd style."""
@@ -115,18 +109,19 @@ def _condenser_account_object(row):
                        }})}
 
 def _condenser_post_object(row, truncate_body=0):
-    """Given a hive_posts_cache row, create a legacy-style post object."""
+    """Given a hive_posts_cache row, create a legacy-style post object.
+
+    Only reads `row`, so db rows can be passed without copying."""
     paid = row['is_paidout']
 
     # condenser#3424 mitigation
-    if not row['category']:
-        row['category'] = 'undefined'
+    category = row['category'] or 'undefined'
 
     post = {}
     post['post_id'] = row['post_id']
     post['author'] = row['author']
     post['permlink'] = row['permlink']
-    post['category'] = row['category']
+    post['category'] = category
 
     post['title'] = row['title']
     post['body'] = row['body'][0:truncate_body] if truncate_body else row['body']
@@ -160,7 +155,7 @@ def _condenser_post_object(row, truncate_body=0):
         post['parent_permlink'] = raw_json['parent_permlink']
     else:
         post['parent_author'] = ''
-        post['parent_permlink'] = row['category']
+        post['parent_permlink'] = category
 
     post['url'] = raw_json['url']
     post['root_title'] = raw_json['root_title']
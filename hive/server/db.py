@@ -22,7 +22,13 @@ def sqltimer(function):
     return _wrapper
 
 class Db:
-    """Wrapper for aiopg.sa db driver."""
+    """Wrapper for aiopg.sa db driver.
+
+    psycopg2's async mode (used by aiopg) does not support server-side
+    cursors; a result set is fully received once `execute` returns, so
+    `fetchall` is the cheapest way to read it (row-wise `async for`
+    only adds an await per row).
+    """
 
     @classmethod
     async def create(cls, url):
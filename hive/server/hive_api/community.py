@@ -82,10 +82,9 @@ async def list_top_communities(context, limit=25):
     if (len(hive_names) == 0):
         custom = []
     else:
-        hive_names_str = ','.join(["'" + hive_name + "'" for hive_name in hive_names])
         sql = """SELECT name, title FROM hive_communities
-                  WHERE name in ({})""".format(hive_names_str)
-        out = await context['db'].query_all(sql)
+                  WHERE name = ANY(:names)"""
+        out = await context['db'].query_all(sql, names=hive_names)
         custom = [(r[0], r[1]) for r in out]
 
     if (len(custom) < limit):
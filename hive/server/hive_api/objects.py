@@ -1,5 +1,6 @@
 """Hive API: account, post, and comment object retrieval"""
 import logging
+from heapq import nlargest
 from hive.server.hive_api.common import get_account_id, estimated_sp
 log = logging.getLogger(__name__)
 
@@ -71,8 +72,8 @@ async def comments_by_id(db, ids, observer=None):
     sql = """SELECT post_id, author, permlink, body, depth,
                     payout, payout_at, is_paidout, created_at, updated_at,
                     rshares, is_hidden, is_grayed, votes
-               FROM hive_posts_cache WHERE post_id IN :ids""" #votes
-    result = await db.query_all(sql, ids=tuple(ids))
+               FROM hive_posts_cache WHERE post_id = ANY(:ids)""" #votes
+    result = await db.query_all(sql, ids=list(ids))
 
     authors = set()
     by_id = {}
@@ -108,28 +109,35 @@ async def posts_by_id(db, ids, observer=None, lite=True):
     """Given a list of post ids, returns lite post objects in the same order."""
 
     # pylint: disable=too-many-locals
-    sql = """SELECT post_id, author, permlink, title, img_url, payout, promoted,
-                    created_at, payout_at, is_nsfw, rshares, votes,
-                    is_muted, is_invalid, %s
-               FROM hive_posts_cache WHERE post_id IN :ids"""
+    # observer's reblog status and hive_posts flags are joined in (w/o
+    # observer the reblog never matches); rows come back in input order
+    sql = """SELECT hp.post_id, hp.author, hp.permlink, hp.title, hp.img_url,
+                    hp.payout, hp.promoted, hp.created_at, hp.payout_at,
+                    hp.is_paidout, hp.is_nsfw, hp.rshares, hp.votes,
+                    hp.is_muted, hp.is_invalid, %s,
+                    (hr.post_id IS NOT NULL) AS reblogged,
+                    p.parent_id, p.community_id, p.category,
+                    p.is_muted AS post_is_muted, p.is_valid
+               FROM unnest(CAST(:ids AS integer[])) WITH ORDINALITY AS u(id, ord)
+               JOIN hive_posts_cache hp ON hp.post_id = u.id
+               JOIN hive_posts p ON p.id = hp.post_id
+          LEFT JOIN hive_reblogs hr ON hr.post_id = hp.post_id
+                                   AND hr.account = :observer
+           ORDER BY u.ord"""
     fields = ['preview'] if lite else ['body', 'updated_at', 'json']
-    sql = sql % (', '.join(fields))
-
-    reblogged_ids = await _reblogged_ids(db, observer, ids) if observer else []
+    sql = sql % (', '.join(['hp.' + field for field in fields]))
 
     # TODO: filter out observer's mutes?
 
-    # key by id.. returns sorted by input order
     authors = set()
-    by_id = {}
-    for row in await db.query_all(sql, ids=tuple(ids)):
+    posts = []
+    for row in await db.query_all(sql, ids=list(ids), observer=observer or ''):
         assert not row['is_muted']
         assert not row['is_invalid']
-        pid = row['post_id']
         top_votes, observer_vote = _top_votes(row, 5, observer)
 
         obj = {
-            'id': pid,
+            'id': row['post_id'],
             'author': row['author'],
             'url': row['author'] + '/' + row['permlink'],
             'title': row['title'],
@@ -153,28 +161,31 @@ async def posts_by_id(db, ids, observer=None, lite=True):
 
         if observer:
             obj['context'] = {
-                'reblogged': obj['id'] in reblogged_ids,
+                'reblogged': row['reblogged'],
                 'vote_rshares': observer_vote
             }
 
+        obj['parent_id'] = row['parent_id']
+        obj['community_id'] = row['community_id']
+        obj['category'] = row['category']
+        obj['is_muted'] = row['post_is_muted']
+        obj['is_valid'] = row['is_valid']
+
         authors.add(obj['author'])
-        by_id[row['post_id']] = obj
+        posts.append(obj)
 
-    # in rare cases of cache inconsistency, recover and warn
-    missed = set(ids) - by_id.keys()
-    if missed:
+    # in rare cases of cache inconsistency, warn; missing rows are skipped
+    if len(posts) < len(ids):
+        missed = set(ids) - {post['id'] for post in posts}
         log.warning("by_id do not exist in cache: %s", repr(missed))
-        for _id in missed:
-            ids.remove(_id)
 
-    by_id = await _append_flags(db, by_id)
-    return {'posts': [by_id[_id] for _id in ids],
+    return {'posts': posts,
             'accounts': await accounts_by_name(db, authors, observer, lite=True)}
 
 async def _append_flags(db, posts):
     sql = """SELECT id, parent_id, community_id, category, is_muted, is_valid
-               FROM hive_posts WHERE id IN :ids"""
-    for row in await db.query_all(sql, ids=tuple(posts.keys())):
+               FROM hive_posts WHERE id = ANY(:ids)"""
+    for row in await db.query_all(sql, ids=list(posts.keys())):
         post = posts[row['id']]
         post['parent_id'] = row['parent_id']
         post['community_id'] = row['community_id']
@@ -183,25 +194,20 @@ async def _append_flags(db, posts):
         post['is_valid'] = row['is_valid']
     return posts
 
-async def _reblogged_ids(db, observer, post_ids):
-    sql = """SELECT post_id FROM hive_reblogs
-              WHERE account = :observer
-                AND post_id IN :ids"""
-    return  await db.query_col(sql, observer=observer, ids=tuple(post_ids))
-
 def _top_votes(obj, limit, observer):
+    vote_csv = obj['votes']
+    if not vote_csv:
+        return ([], None)
+
+    votes = [(voter, int(rshares)) for voter, rshares, _ in
+             (csa.split(",", 2) for csa in vote_csv.split("\n"))]
+    top = nlargest(limit, votes, key=lambda row: abs(row[1]))
+
+    # observer's own vote: one C-level scan instead of a per-row compare
     observer_vote = None
-    votes = []
-    if obj['votes']:
-        for csa in obj['votes'].split("\n"):
-            print(">>>"+csa+"<<<<")
-            voter, rshares = csa.split(",")[0:2]
-            rshares = int(rshares)
-            votes.append((voter, rshares))
-
-            if observer == voter:
-                observer_vote = rshares
-
-    top = sorted(votes, key=lambda row: abs(int(row[1])), reverse=True)[:limit]
+    if observer:
+        pos = ("\n" + vote_csv).find("\n" + observer + ",")
+        if pos != -1:
+            observer_vote = int(vote_csv[pos:].split(",", 2)[1])
 
     return (top, observer_vote)
@@ -103,8 +103,7 @@ async def list_account_feed(context, account, limit=10, observer=None, last_post
 
     # Merge reblogged_by data into result set
     for post in posts:
-        rby = set(reblog_by[post['post_id']].split(','))
-        rby.discard(post['author'])
-        if rby: post['reblogged_by'] = list(rby)
+        rby = reblog_by[post['post_id']]
+        if rby: post['reblogged_by'] = rby
 
     return posts
@@ -44,9 +44,9 @@ async def _fetch_children(db, root_id, start_id, sort, limit, observer=None):
         seek = """AND %s < (SELECT %s FROM hive_posts_cache
                              WHERE post_id = :start_id)""" % (field, field)
     sql = """SELECT post_id FROM hive_posts_cache
-              WHERE post_id IN :ids %s ORDER BY %s DESC
+              WHERE post_id = ANY(:ids) %s ORDER BY %s DESC
               LIMIT :limit""" % (seek, field)
-    relevant_ids = await db.query_col(sql, ids=tuple(parent.keys()),
+    relevant_ids = await db.query_col(sql, ids=list(parent.keys()),
                                       start_id=start_id, limit=limit)
 
     # fill in missing parents
@@ -124,11 +124,11 @@ async def _child_ids(db, parent_ids, muted):
     sql = """
              SELECT parent_id, array_agg(id)
                FROM hive_posts
-              WHERE parent_id IN :ids
+              WHERE parent_id = ANY(:ids)
                 AND is_deleted = '0'
                 AND is_muted = '0'
                 AND is_valid = '1' %s
            GROUP BY parent_id
     """ % filt
-    rows = await db.query_all(sql, ids=tuple(parent_ids), muted=tuple(muted))
+    rows = await db.query_all(sql, ids=list(parent_ids), muted=tuple(muted))
     return [[row[0], row[1]] for row in rows]
@@ -4,10 +4,13 @@ import os
 import sys
 import logging
 import time
+from functools import partial
 
 from datetime import datetime
+import ujson as json
 from sqlalchemy.exc import OperationalError
 from aiohttp import web
+from aiocache import cached
 from jsonrpcserver.methods import Methods
 from jsonrpcserver import async_dispatch as dispatch
 
@@ -30,12 +33,19 @@ from hive.server.db import Db
 
 # pylint: disable=too-many-lines
 
-async def db_head_state(context):
-    """Status/health check."""
-    db = context['db']
+# response encoder: ujson's C encoder in place of aiohttp's stdlib default
+_dumps = partial(json.dumps, escape_forward_slashes=False)
+
+@cached(ttl=1, timeout=1200)
+async def _head_block_row(db):
+    """Get hive's head block; shared among concurrent health checks."""
     sql = ("SELECT num, created_at, extract(epoch from created_at) ts "
            "FROM hive_blocks ORDER BY num DESC LIMIT 1")
-    row = await db.query_row(sql)
+    return await db.query_row(sql)
+
+async def db_head_state(context):
+    """Status/health check."""
+    row = await _head_block_row(context['db'])
     return dict(db_head_block=row['num'],
                 db_head_time=str(row['created_at']),
                 db_head_age=int(time.time() - row['ts']))
@@ -255,7 +265,8 @@ def run_server(conf):
         response = await dispatch(request, methods=methods, debug=True, context=app)
         if response.wanted:
             headers = {'Access-Control-Allow-Origin': '*'}
-            return web.json_response(response.deserialized(), status=200, headers=headers)
+            return web.json_response(response.deserialized(), status=200,
+                                     headers=headers, dumps=_dumps)
         return web.Response()
 
     if conf.get('sync_to_s3'):
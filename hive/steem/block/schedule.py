@@ -1,6 +1,6 @@
 """Block scheduler."""
 import logging
-from time import time, sleep
+from time import time, monotonic, sleep
 from hive.utils.normalize import block_date, utc_timestamp
 from hive.utils.stats import Stats
 
@@ -18,7 +18,7 @@ class BlockSchedule:
     def __init__(self, current_head_block):
         self._start_block = current_head_block
         self._head_num = current_head_block
-        self._next_expected = time() + self.BLOCK_INTERVAL / 2
+        self._next_expected = monotonic() + self.BLOCK_INTERVAL / 2
         self._drift = self.BLOCK_INTERVAL / 2
         self._missed = 0
         self._last_date = None
@@ -27,7 +27,7 @@ class BlockSchedule:
         """Sleep until the requested block is expected to be available.
 
         Returns current head block (which is always gte `num`)"""
-        head_time = time() - self._drift
+        head_time = monotonic() - self._drift
 
         # if slots missed, advance head block
         while head_time >= self._next_expected:
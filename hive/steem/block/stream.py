@@ -76,8 +76,9 @@ class BlockStream:
         Will run forever unless `max_gap` is specified and exceeded.
         """
         curr = start_block
-        head = self._client.head_block()
-        prev = self._client.get_block(curr - 1)['block_id']
+        prev, head = self._client.get_block_and_head(curr - 1)
+        assert prev, 'block %d not available' % (curr - 1)
+        prev = prev['block_id']
 
         queue = BlockQueue(self._min_gap, prev)
         schedule = BlockSchedule(head)
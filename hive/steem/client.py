@@ -1,16 +1,18 @@
 """Tight and reliable steem API client for hive indexer."""
 
-from time import perf_counter as perf
-from decimal import Decimal
+from time import perf_counter as perf, monotonic
 
 from hive.utils.stats import Stats
-from hive.utils.normalize import parse_amount, steem_amount, vests_amount
+from hive.utils.normalize import float_amount
 from hive.steem.http_client import HttpClient
 from hive.steem.block.stream import BlockStream
 
 class SteemClient:
     """Handles upstream calls to jussi/steemd, with batching and retrying."""
 
+    # Seconds to reuse feed/market prices in `gdgp_extended`
+    PRICE_TTL = 300
+
     def __init__(self, url='https://api.steemit.com', max_batch=50, max_workers=1):
         assert url, 'steem-API endpoint undefined'
         assert max_batch > 0 and max_batch <= 5000
@@ -20,6 +22,10 @@ class SteemClient:
         self._max_workers = max_workers
         self._client = HttpClient(nodes=[url])
 
+        # (usd_per_steem, sbd_per_steem), and monotonic time fetched
+        self._prices = None
+        self._prices_at = 0
+
     def get_accounts(self, accounts):
         """Fetch multiple accounts by name."""
         assert accounts, "no accounts passed to get_accounts"
@@ -60,6 +66,17 @@ class SteemClient:
         else:
             return None
 
+    def get_block_and_head(self, num):
+        """Fetch block `num` and the head block number in one request.
+
+        Returns `(block, head_num)`; block is None if not yet available.
+        """
+        dgpo, result = self.__exec_mixed([
+            ('get_dynamic_global_properties', None),
+            ('get_block', {'block_num': num})])
+        assert 'time' in dgpo, "gdgp invalid resp: %s" % dgpo
+        return result.get('block'), dgpo['head_block_number']
+
     def stream_blocks(self, start_from, trail_blocks=0, max_gap=100):
         """Stream blocks. Returns a generator."""
         return BlockStream.stream(self, start_from, trail_blocks, max_gap)
@@ -83,7 +100,18 @@ class SteemClient:
 
     def gdgp_extended(self):
         """Get dynamic global props without the cruft plus useful bits."""
-        dgpo = self._gdgp()
+        if self._prices and monotonic() - self._prices_at < self.PRICE_TTL:
+            # prices move slowly; only dgpo needs to be fresh
+            dgpo = self._gdgp()
+        else:
+            dgpo, feed, orders = self.__exec_mixed([
+                ('get_dynamic_global_properties', None),
+                ('get_feed_history', None),
+                ('get_order_book', [1])])
+            assert 'time' in dgpo, "gdgp invalid resp: %s" % dgpo
+            self._prices = (self._get_feed_price(feed),
+                            self._get_steem_price(orders))
+            self._prices_at = monotonic()
 
         # remove unused/deprecated keys
         unused = ['total_pow', 'num_pow_witnesses', 'confidential_supply',
@@ -94,27 +122,28 @@ class SteemClient:
 
         return {
             'dgpo': dgpo,
-            'usd_per_steem': self._get_feed_price(),
-            'sbd_per_steem': self._get_steem_price(),
+            'usd_per_steem': self._prices[0],
+            'sbd_per_steem': self._prices[1],
             'steem_per_mvest': SteemClient._get_steem_per_mvest(dgpo)}
 
     @staticmethod
     def _get_steem_per_mvest(dgpo):
-        steem = steem_amount(dgpo['total_vesting_fund_steem'])
-        mvests = vests_amount(dgpo['total_vesting_shares']) / Decimal(1e6)
+        steem = float_amount(dgpo['total_vesting_fund_steem'], 'STEEM')
+        mvests = float_amount(dgpo['total_vesting_shares'], 'VESTS') / 1e6
         return "%.6f" % (steem / mvests)
 
-    def _get_feed_price(self):
+    @staticmethod
+    def _get_feed_price(feed_history):
         # TODO: add latest feed price: get_feed_history.price_history[0]
-        feed = self.__exec('get_feed_history')['current_median_history']
-        units = dict([parse_amount(feed[k])[::-1] for k in ['base', 'quote']])
+        feed = feed_history['current_median_history']
+        units = dict([float_amount(feed[k])[::-1] for k in ['base', 'quote']])
         price = units['SBD'] / units['STEEM']
         return "%.6f" % price
 
-    def _get_steem_price(self):
-        orders = self.__exec('get_order_book', [1])
-        ask = Decimal(orders['asks'][0]['real_price'])
-        bid = Decimal(orders['bids'][0]['real_price'])
+    @staticmethod
+    def _get_steem_price(orders):
+        ask = float(orders['asks'][0]['real_price'])
+        bid = float(orders['bids'][0]['real_price'])
         price = (ask + bid) / 2
         return "%.6f" % price
 
@@ -123,8 +152,9 @@ class SteemClient:
         block_nums = range(lbound, ubound)
         blocks = {}
 
+        # shards may land in any order; blocks are keyed by num below
         batch_params = [{'block_num': i} for i in block_nums]
-        for result in self.__exec_batch('get_block', batch_params):
+        for result in self.__exec_batch_iter('get_block', batch_params, ordered=False):
             assert 'block' in result, "result w/o block key: %s" % result
             block = result['block']
             num = int(block['block_id'][:8], base=16)
@@ -140,17 +170,32 @@ class SteemClient:
         Stats.log_steem(method, perf() - start, items)
         return result
 
-    def __exec_batch(self, method, params):
-        """Perform batch call. Based on config uses either batch or futures."""
+    def __exec_mixed(self, calls):
+        """Perform several different steemd calls in one batch request."""
         start = perf()
+        result = self._client.exec_mixed(calls)
+        for method, _ in calls:
+            Stats.log_steem(method, (perf() - start) / len(calls))
+        return result
+
+    def __exec_batch(self, method, params, ordered=True):
+        """Perform batch call. Based on config uses either batch or futures.
+
+        If `ordered` is False, results are returned in completion order.
+        """
+        return list(self.__exec_batch_iter(method, params, ordered))
 
-        result = []
-        for part in self._client.exec_multi(
+    def __exec_batch_iter(self, method, params, ordered=True):
+        """Like `__exec_batch`, but yields results as each part arrives."""
+        start = perf()
+
+        multi = (self._client.exec_multi if ordered
+                 else self._client.exec_multi_as_completed)
+        for part in multi(
                 method,
                 params,
                 max_workers=self._max_workers,
                 batch_size=self._max_batch):
-            result.extend(part)
+            yield from part
 
         Stats.log_steem(method, perf() - start, len(params))
-        return result
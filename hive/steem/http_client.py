@@ -26,11 +26,13 @@ def validated_json_payload(response):
     if response.status != 200:
         raise HTTPError(response.status, "non-200 response")
 
+    data = response.data
     try:
-        data = response.data.decode('utf-8')
+        # ujson decodes utf-8 bytes directly
         payload = json.loads(data)
     except Exception as e:
-        raise Exception("JSON error %s: %s" % (str(e), data[0:1024]))
+        raise Exception("JSON error %s: %s" % (
+            str(e), data[0:1024].decode('utf-8', 'replace')))
 
     return payload
 
@@ -95,15 +97,23 @@ class HttpClient(object):
         if kwargs.get('tcp_keepalive', True):
             socket_options = HTTPConnection.default_socket_options + \
                              [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1), ]
+            # probe idle pooled connections so dead ones are dropped
+            # promptly instead of stalling a request until timeout
+            for opt, val in (('TCP_KEEPIDLE', 60), ('TCP_KEEPINTVL', 10),
+                             ('TCP_KEEPCNT', 3)):
+                if hasattr(socket, opt):
+                    socket_options.append((socket.IPPROTO_TCP, getattr(socket, opt), val))
         else:
             socket_options = HTTPConnection.default_socket_options
 
+        # with `block`, concurrent requests wait for a pooled keep-alive
+        # connection rather than opening one-off connections past maxsize
         self.http = urllib3.poolmanager.PoolManager(
             num_pools=kwargs.get('num_pools', 10),
             maxsize=kwargs.get('maxsize', 64),
             timeout=kwargs.get('timeout', 30),
             socket_options=socket_options,
-            block=False,
+            block=True,
             retries=Retry(total=False),
             headers={
                 'Content-Type': 'application/json',
@@ -142,6 +152,20 @@ class HttpClient(object):
         """Execute a steemd RPC method, retrying on failure."""
         what = "%s[%d]" % (method, len(args) if is_batch else 1)
         body = self.rpc_body(method, args, is_batch)
+        return self._exec_body(what, body)
+
+    def exec_mixed(self, calls):
+        """Execute a list of `(method, args)` calls as one batch request.
+
+        Results are returned in the same order as `calls`.
+        """
+        what = '+'.join(method for method, _ in calls)
+        body = [_rpc_body(self.METHOD_API[method] + '.' + method, args, i+1)
+                for i, (method, args) in enumerate(calls)]
+        return self._exec_body(what, body)
+
+    def _exec_body(self, what, body):
+        """POST a JSON-RPC request body, retrying on failure."""
         body_data = json.dumps(body, ensure_ascii=False).encode('utf8')
 
         tries = 0
@@ -181,14 +205,14 @@ class HttpClient(object):
                 self.next_node()
             sleep(tries / 5)
 
-        raise Exception("abort %s after %d tries" % (method, tries))
+        raise Exception("abort %s after %d tries" % (what, tries))
 
     def exec_multi(self, name, params, max_workers, batch_size):
         """Process a batch as parallel requests."""
         chunks = [[name, args, True] for args in chunkify(params, batch_size)]
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             for items in executor.map(lambda tup: self.exec(*tup), chunks):
-                yield list(items) # (use of `map` preserves request order)
+                yield items # (use of `map` preserves request order)
 
     def exec_multi_as_completed(self, name, params, max_workers, batch_size):
         """Process a batch as parallel requests; yields unordered."""
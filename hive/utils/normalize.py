@@ -50,6 +50,31 @@ def parse_amount(value, expected_unit=None):
 
     return (dec_amount, unit)
 
+def float_amount(value, expected_unit=None):
+    """Like `parse_amount`, but as a float. For ratios, not balances."""
+    if isinstance(value, dict):
+        value = [value['amount'], value['precision'], value['nai']]
+
+    if isinstance(value, str):
+        raw_amount, _, unit = value.partition(' ')
+        flt_amount = float(raw_amount)
+
+    elif isinstance(value, list):
+        satoshis, precision, nai = value
+        flt_amount = int(satoshis) / (10**precision)
+        assert nai in NAI_MAP, "unknown NAI %s; expected %s" % (
+            nai, expected_unit or '(any)')
+        unit = NAI_MAP[nai]
+
+    else:
+        raise Exception("invalid input amount %s" % repr(value))
+
+    if expected_unit:
+        assert unit == expected_unit
+        return flt_amount
+
+    return (flt_amount, unit)
+
 def amount(string):
     """Parse a steemd asset-amount as a Decimal(). Discard asset type."""
     return parse_amount(string)[0]
@@ -2,15 +2,35 @@
 
 import atexit
 import logging
+import re
 
 from time import perf_counter as perf
 from hive.utils.system import colorize, peak_usage_mb
 
 log = logging.getLogger(__name__)
 
+# multi-row VALUES lists (e.g. batched trxid inserts) vary per call
+_VALUES_RE = re.compile(r'VALUES\s*(\s*\([^\)]+\),?)+', re.IGNORECASE)
+
+# normalized sql by raw sql; templates repeat, so memoize (FIFO-bounded)
+_NORM_CACHE = {}
+_NORM_CACHE_SIZE = 4096
+
+def _normalize_sql_cached(sql):
+    """Normalize sql, reusing results for previously seen statements."""
+    out = _NORM_CACHE.get(sql)
+    if out is None:
+        out = _normalize_sql(sql)
+        if len(_NORM_CACHE) >= _NORM_CACHE_SIZE:
+            del _NORM_CACHE[next(iter(_NORM_CACHE))]
+        _NORM_CACHE[sql] = out
+    return out
+
 def _normalize_sql(sql, maxlen=180):
-    """Collapse whitespace and middle-truncate if needed."""
+    """Collapse whitespace and VALUES lists; middle-truncate if needed."""
     out = ' '.join(sql.split())
+    if 'VALUES' in out.upper():
+        out = _VALUES_RE.sub('VALUES (...)', out)
     if len(out) > maxlen:
         i = int(maxlen / 2 - 4)
         out = (out[0:i] +
@@ -98,8 +118,10 @@ class SteemStats(StatsAbstract):
         """Warn if a request (accounting for batch size) is too slow."""
         if call == 'get_block' and batch_size > 1:
             call = 'get_blocks_batch'
-        per = int((ms - self.PAR_HTTP_OVERHEAD) / batch_size)
         par = self.PAR_STEEMD[call]
+        if ms < self.PAR_HTTP_OVERHEAD + par * self.PAR_THRESHOLD * batch_size:
+            return # common case: within par, nothing to compute
+        per = int((ms - self.PAR_HTTP_OVERHEAD) / batch_size)
         over = per / par
         if over >= self.PAR_THRESHOLD:
             out = ("[STEEM][%dms] %s[%d] -- %.1fx par (%d/%d)"
@@ -125,7 +147,11 @@ class Stats:
     """Container for steemd and db timing data."""
     PRINT_THRESH_MINS = 1
 
+    # Number of buffered db timings before they are aggregated
+    DB_FLUSH_SIZE = 256
+
     _db = DbStats()
+    _db_buf = []
     _steemd = SteemStats()
     _secs = 0.0
     _idle = 0.0
@@ -133,10 +159,19 @@ class Stats:
 
     @classmethod
     def log_db(cls, sql, secs):
-        """Log a database query. Incoming SQL is normalized."""
-        cls._db.add(_normalize_sql(sql), secs * 1000)
+        """Log a database query. Buffered; normalized upon flush."""
+        cls._db_buf.append((sql, secs * 1000))
+        if len(cls._db_buf) >= cls.DB_FLUSH_SIZE:
+            cls.flush_db()
         cls.add_secs(secs)
 
+    @classmethod
+    def flush_db(cls):
+        """Normalize and aggregate buffered db timings."""
+        buf, cls._db_buf = cls._db_buf, []
+        for sql, ms in buf:
+            cls._db.add(_normalize_sql_cached(sql), ms)
+
     @classmethod
     def log_steem(cls, method, secs, batch_size=1):
         """Log a steemd call."""
@@ -161,6 +196,7 @@ class Stats:
     @classmethod
     def report(cls):
         """Emit a timing report for tracked services."""
+        cls.flush_db()
         if not cls._secs:
             return # nothing to report
         total = perf() - cls._start
@@ -0,0 +1,21 @@
+"""Fixtures for indexer tests."""
+import importlib
+import sys
+
+import pytest
+
+from hive.db.adapter import Db
+
+@pytest.fixture
+def indexer_module(monkeypatch):
+    """Import hive.indexer modules against an unconnected shared db.
+
+    Indexer modules bind `Db.instance()` at import time. The stub is only
+    set for the test, and modules imported under it are dropped after, so
+    other tests still get the real shared db."""
+    monkeypatch.setattr(Db, '_instance', Db.__new__(Db))
+    before = set(sys.modules)
+    yield importlib.import_module
+    for name in set(sys.modules) - before:
+        if name.startswith('hive.'):
+            del sys.modules[name]
@@ -0,0 +1,29 @@
+#pylint: disable=missing-docstring,redefined-outer-name
+import pytest
+
+@pytest.fixture
+def community(indexer_module):
+    return indexer_module('hive.indexer.community').Community
+
+def test_validated_name_length(community):
+    assert not community.validated_name('hive-1234')
+    assert community.validated_name('hive-12345') == 'hive-12345'
+    assert community.validated_name('hive-123456') == 'hive-123456'
+    assert community.validated_name('hive-1234567') == 'hive-1234567'
+    assert not community.validated_name('hive-12345678')
+
+def test_validated_name_type(community):
+    assert community.validated_name('hive-11111')
+    assert community.validated_name('hive-21111')
+    assert community.validated_name('hive-31111')
+    assert not community.validated_name('hive-41111')
+    assert not community.validated_name('hive-01111')
+
+def test_validated_name_invalid(community):
+    assert not community.validated_name('hive-1234a')
+    assert not community.validated_name('hive-a2345')
+    assert not community.validated_name('hive-1-234')
+    assert not community.validated_name('hivf-12345')
+    assert not community.validated_name('hive-')
+    assert not community.validated_name('hive')
+    assert not community.validated_name('')
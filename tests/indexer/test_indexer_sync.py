@@ -0,0 +1,46 @@
+#pylint: disable=missing-docstring,protected-access,redefined-outer-name
+import os
+
+import pytest
+
+LINES = 2500
+
+@pytest.fixture
+def sync(indexer_module):
+    return indexer_module('hive.indexer.sync')
+
+def _checkpoint(tmp_path, lines=LINES):
+    path = str(tmp_path / '0001.json.lst')
+    with open(path, 'wb') as f:
+        for i in range(lines):
+            f.write(b'{"num": %d}\n' % i)
+    return path
+
+def _first_after(sync, path, count):
+    with open(path, 'rb') as f:
+        return next(iter(sync._skip_lines(f, path, count)), None)
+
+def test_skip_lines_anchors(sync, tmp_path):
+    path = _checkpoint(tmp_path)
+    for count in (0, 999, 1000, 1001, 2000, LINES - 1):
+        assert _first_after(sync, path, count) == b'{"num": %d}\n' % count
+    assert _first_after(sync, path, LINES) is None
+    assert _first_after(sync, path, LINES + 1500) is None
+
+def test_skip_lines_builds_index(sync, tmp_path):
+    path = _checkpoint(tmp_path)
+    _first_after(sync, path, 1)
+    assert os.path.getsize(path + '.idx') == 8 * 3
+    # reused on the next call
+    assert _first_after(sync, path, sync.CHECKPOINT_IDX_STEP + 5) == b'{"num": 1005}\n'
+
+def test_skip_lines_truncated_index(sync, tmp_path):
+    path = _checkpoint(tmp_path)
+    with open(path + '.idx', 'wb') as idx:
+        idx.write(b'\0' * 5)
+    assert _first_after(sync, path, 1001) == b'{"num": 1001}\n'
+
+def test_skip_lines_empty_file(sync, tmp_path):
+    path = _checkpoint(tmp_path, lines=0)
+    assert _first_after(sync, path, 0) is None
+    assert _first_after(sync, path, 10) is None
@@ -1,7 +1,9 @@
 #pylint: disable=missing-docstring,line-too-long
 import json
+import pytest
 
 from hive.utils.account import safe_profile_metadata
+from hive.server.common.helpers import valid_account, valid_tag
 
 def test_valid_account():
     raw_profile = dict(
@@ -40,3 +42,22 @@ def test_invalid_account():
     assert safe_profile['website'] == 'http://davincilife.com/' # TODO: should normalize to https?
     assert safe_profile['cover_image'] == ''
     assert safe_profile['profile_image'] == ''
+
+def test_valid_account_name():
+    for name in ['foo', 'foo-bar.baz', 'a1b', 'abcdefghijklmnop']:
+        assert valid_account(name) == name
+    assert valid_account('', allow_empty=True) == ''
+
+    for name in ['', 'fo', 'abcdefghijklmnopq', '@foo', 'Foo', 'foo_bar',
+                 'foo bar', 'foo\n', 'f\u00f6o']:
+        with pytest.raises(AssertionError):
+            valid_account(name)
+
+def test_valid_tag():
+    for tag in ['photography', 'hive-123456', 'foo_bar', '1']:
+        assert valid_tag(tag) == tag
+    assert valid_tag('', allow_empty=True) == ''
+
+    for tag in ['', 'Foo', 'foo.bar', 'foo bar', 'foo\n', 'tag#', '\u00fcber']:
+        with pytest.raises(AssertionError):
+            valid_tag(tag)
@@ -0,0 +1,10 @@
+#pylint: disable=missing-docstring
+from datetime import datetime
+from hive.server.common.helpers import json_date
+
+def test_json_date():
+    assert json_date() == '1969-12-31T23:59:59'
+    assert json_date(None) == '1969-12-31T23:59:59'
+    assert json_date(datetime(2019, 1, 1, 12, 30, 5)) == '2019-01-01T12:30:05'
+    assert json_date('2019-01-01T12:30:05') == '2019-01-01T12:30:05'
+    assert json_date('2019-01-01 12:30:05') == '2019-01-01T12:30:05'
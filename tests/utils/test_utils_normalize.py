@@ -11,6 +11,7 @@ from hive.utils.normalize import (
     steem_amount,
     sbd_amount,
     parse_amount,
+    float_amount,
     amount,
     legacy_amount,
     parse_time,
@@ -50,6 +51,11 @@ def test_parse_amount():
     nai = [1231121, 6, '@@000000037']
     assert parse_amount(nai, 'VESTS') == Decimal('1.231121')
 
+def test_float_amount():
+    nai = [1231121, 6, '@@000000037']
+    assert float_amount(nai, 'VESTS') == 1.231121
+    assert float_amount('0.250 SBD') == (0.25, 'SBD')
+
 def test_amount():
     assert amount('3.432 FOO') == Decimal('3.432')
 
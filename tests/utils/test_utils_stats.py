@@ -0,0 +1,42 @@
+#pylint: disable=missing-docstring,protected-access
+from hive.utils.stats import Stats, SteemStats, _normalize_sql, _normalize_sql_cached
+
+def test_normalize_sql_whitespace():
+    sql = """SELECT id
+               FROM hive_accounts
+              WHERE name = :name"""
+    assert _normalize_sql(sql) == 'SELECT id FROM hive_accounts WHERE name = :name'
+
+def test_normalize_sql_values():
+    sql = ("INSERT INTO hive_trxid_block_num (trx_id, block_num) VALUES "
+           "('abc', 1),('def', 1)")
+    out = 'INSERT INTO hive_trxid_block_num (trx_id, block_num) VALUES (...)'
+    assert _normalize_sql(sql) == out
+    assert _normalize_sql(sql.replace('VALUES', 'Values')) == out
+
+def test_normalize_sql_truncate():
+    out = _normalize_sql('SELECT ' + 'x, ' * 200 + 'y FROM z', maxlen=40)
+    assert len(out) <= 40
+    assert ' ... ' in out
+
+def test_log_db_buffered():
+    Stats.flush_db()
+    Stats._db.clear()
+    Stats.log_db('SELECT 1', 0.001)
+    assert not Stats._db.table()
+    Stats.flush_db()
+    assert Stats._db.table()[0][0] == 'SELECT 1'
+    Stats._db.clear()
+
+def test_normalize_sql_cached():
+    sql = "SELECT  id\n FROM hive_posts"
+    assert _normalize_sql_cached(sql) == 'SELECT id FROM hive_posts'
+    assert _normalize_sql_cached(sql) == 'SELECT id FROM hive_posts'
+
+def test_steem_check_timing(caplog):
+    stats = SteemStats()
+    stats.check_timing('get_block', 100, 1)
+    stats.check_timing('get_block', 500, 100)
+    assert not caplog.records
+    stats.check_timing('get_block', 500, 1)
+    assert len(caplog.records) == 1